@@ -0,0 +1,125 @@
+"""
+arrow_metadata.py
+
+Columnar metadata store for text chunks, backed by an Arrow IPC (Feather v2) file.
+
+Unpickling a metadata dict allocates a Python object for every field of every chunk.
+An uncompressed Arrow file can instead be memory-mapped: loading is nearly instant, the
+strings stay in the file's pages, and only the rows returned by a search are turned
+into Python dicts.
+
+Responsibilities:
+- Save chunk metadata as an Arrow table with one row per vector id
+- Memory-map the table when loading
+- Expose it as a read-only mapping of vector id -> metadata dict
+
+Technologies:
+- PyArrow (IPC file format, memory mapping)
+"""
+
+import operator
+import os
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+ARROW_SUFFIXES = (".arrow", ".feather")
+
+
+def is_arrow_path(path: str) -> bool:
+    """
+    Check whether a metadata path refers to an Arrow file (by its suffix).
+
+    Args:
+        path (str): Metadata file path.
+
+    Returns:
+        bool: True for .arrow / .feather files.
+    """
+    return path.lower().endswith(ARROW_SUFFIXES)
+
+
+def save_arrow_metadata(metadata: Dict[int, Dict[str, Any]], path: str) -> None:
+    """
+    Save chunk metadata as an uncompressed Arrow IPC file, so that it can be memory-mapped.
+
+    Row i of the table holds the metadata of vector id i, so the ids must be 0..N-1.
+    Like vectorstore_utils.write_index, the file is written to a temporary path and renamed,
+    so processes that still memory-map the old file keep reading it.
+
+    Args:
+        metadata (Dict[int, Dict]): Dictionary mapping vector IDs to chunk metadata.
+        path (str): Destination .arrow / .feather file.
+
+    Returns:
+        None
+    """
+    ids = sorted(metadata)
+    if ids != list(range(len(ids))):
+        raise ValueError("Arrow metadata needs consecutive vector ids starting at 0")
+
+    table = pa.Table.from_pylist([metadata[i] for i in ids])
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+class ArrowMetadata(Mapping[int, Dict[str, Any]]):
+    """
+    Read-only mapping of vector id -> chunk metadata over an Arrow table.
+
+    Rows are converted to dicts only when accessed; each access returns a new dict.
+    Fields missing from a chunk are returned as None.
+    """
+
+    def __init__(self, table: pa.Table) -> None:
+        """
+        Args:
+            table (pa.Table): Table with one row per vector id.
+        """
+        self.table = table
+
+    @classmethod
+    def open(cls, path: str) -> "ArrowMetadata":
+        """
+        Memory-map an Arrow metadata file written by save_arrow_metadata.
+
+        Args:
+            path (str): Path to the .arrow / .feather file.
+
+        Returns:
+            ArrowMetadata: The metadata mapping.
+        """
+        source = pa.memory_map(path, "r")
+        return cls(pa.ipc.open_file(source).read_all())
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.table.num_rows))
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            row = operator.index(key)  # type: ignore[arg-type]
+        except TypeError:
+            return False
+        return 0 <= row < self.table.num_rows
+
+    def __getitem__(self, key: int) -> Dict[str, Any]:
+        if key not in self:
+            raise KeyError(key)
+        return self.table.slice(int(key), 1).to_pylist()[0]
+
+    def take(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Materialize the metadata of several vector ids at once.
+
+        Args:
+            ids (Sequence[int]): Vector ids, all present in the mapping.
+
+        Returns:
+            List[Dict]: One metadata dict per id, in order.
+        """
+        return self.table.take(pa.array(ids, type=pa.int64())).to_pylist()
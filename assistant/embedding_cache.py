@@ -0,0 +1,116 @@
+"""
+embedding_cache.py
+
+Persistent, content-addressed cache for text embeddings.
+
+Responsibilities:
+- Store embedding vectors on disk keyed by a hash of (model name, text)
+- Look up many texts at once so callers only send cache misses to the API
+- Save new embeddings in a single transaction
+
+Technologies:
+- sqlite3 for a single-file, dependency-free key/value store
+- hashlib (SHA-256) for stable cache keys
+- NumPy for compact float32 serialization of the vectors
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "data/cache/embeddings.sqlite"
+
+# SQLite limits the number of bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """
+    Build the cache key for a (model, text) pair.
+
+    Args:
+        model (str): Name of the embedding model.
+        text (str): The embedded text.
+
+    Returns:
+        str: Hex SHA-256 digest of the model name and text.
+    """
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class SqliteEmbeddingCache:
+    """
+    Embedding cache backed by a single SQLite file with schema (key TEXT PRIMARY KEY, vec BLOB).
+
+    Vectors are stored as raw float32 bytes. A new connection is opened per operation,
+    so one instance can safely be shared between threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Path of the SQLite file. Parent directories are created if needed.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)")
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up the cached embeddings of several texts.
+
+        Args:
+            model (str): Name of the embedding model.
+            texts (Sequence[str]): Texts to look up.
+
+        Returns:
+            list: One entry per text, in order: the cached embedding, or None on a miss.
+        """
+        keys = [make_cache_key(model, text) for text in texts]
+        found = {}
+
+        unique_keys = list(dict.fromkeys(keys))
+        with closing(sqlite3.connect(self.path)) as conn:
+            for start in range(0, len(unique_keys), _MAX_SQL_PARAMS):
+                batch = unique_keys[start:start + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch)
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32).tolist()
+
+        return [found.get(key) for key in keys]
+
+    def put_many(self, model: str, texts: Sequence[str], embeddings: Sequence[Optional[Sequence[float]]]) -> None:
+        """
+        Save embeddings for several texts in a single transaction. None entries are skipped.
+
+        Args:
+            model (str): Name of the embedding model.
+            texts (Sequence[str]): The embedded texts.
+            embeddings (Sequence): Embedding vectors matching `texts`.
+
+        Returns:
+            None
+        """
+        rows = [
+            (make_cache_key(model, text), np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in zip(texts, embeddings)
+            if embedding is not None
+        ]
+        if not rows:
+            return
+
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+        logging.info(f"[INFO] Cached {len(rows)} new embeddings in '{self.path}'")
@@ -6,80 +6,501 @@ Generates embeddings for text chunks using the OpenAI API.
 Responsibilities:
 - Authenticate and connect with OpenAI via environment variables
 - Convert text chunks into vector embeddings using a specific model
+- Batch chunks into as few API requests as possible and send batches concurrently
+- Reuse embeddings of previously seen chunks from a persistent cache
+- Memoize query embeddings for repeated queries, persisted across sessions
+- Embed several queries in one request
+- Retry rate-limited requests with exponential backoff
 - Track embedding progress and handle API errors with logging
 
 Technologies:
-- OpenAI Python SDK for embedding generation
+- OpenAI Python SDK (sync and async clients) for embedding generation
+- asyncio for bounded concurrent requests (uvloop, if installed, can be used as the event loop)
+- httpx connection pool sized to the request concurrency
 - dotenv for API key loading from .env
-- logging and time for monitoring and rate limit control
+- logging for monitoring progress and errors
 """
-from openai import OpenAI
+import httpx
+import openai
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 import os
+import atexit
+import asyncio
 import logging
+import math
+import pickle
+import random
+import threading
 import time
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from assistant.embedding_cache import SqliteEmbeddingCache, DEFAULT_CACHE_PATH
 
+T = TypeVar("T")
 
-# Load environment variables and initialize OpenAI client
+
+# Load environment variables and initialize OpenAI client.
+# The SDK's own retries are disabled so that _call_with_backoff alone decides when to retry
+# (it covers the same transient errors, see _is_retryable).
 load_dotenv() 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+
+# Created lazily by _get_embedding_cache so importing this module never touches the disk
+_embedding_cache: Optional[SqliteEmbeddingCache] = None
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_CONCURRENCY = 5  # safe for the lowest OpenAI usage tier
+MAX_API_BATCH_SIZE = 2048    # OpenAI's limit on inputs per embeddings request
+SUBMIT_JITTER_SECONDS = 0.05  # random delay before each request so batches do not all hit the API at once
+
+# In-flight request limits per OpenAI usage tier (OPENAI_USAGE_TIER env var)
+USAGE_TIER_CONCURRENCY = {
+    "tier1": 35,
+    "tier2": 65,
+    "tier3": 95,
+    "tier4": 125,
+    "tier5": 155,
+}
+
+
+# The same statuses the OpenAI SDK retries by default (plus every 5xx), since its own retries are disabled
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BACKOFF_BASE = 1.0
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Check whether an OpenAI error is a transient error worth retrying.
+
+    Args:
+        error (Exception): The exception raised by the OpenAI SDK.
+
+    Returns:
+        bool: True for rate limits, connection errors and timeouts, and API errors with
+              status 408, 409, 429 or any 5xx.
+    """
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True  # APIConnectionError includes APITimeoutError
+    status = getattr(error, "status_code", None)
+    return isinstance(error, openai.APIError) and status is not None and (status in RETRYABLE_STATUS_CODES or status >= 500)
+
+
+def _backoff_delay(error: Exception, attempt: int, base: float) -> float:
+    """
+    Compute how long to wait before the next retry.
+
+    Uses the server's Retry-After header when present, otherwise exponential backoff
+    with a small random jitter so that concurrent requests do not retry in lockstep.
+
+    Args:
+        error (Exception): The retryable exception raised by the OpenAI SDK.
+        attempt (int): 0-based number of the failed attempt.
+        base (float): Base delay in seconds for the exponential backoff.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form, fall back to exponential backoff
+    return base * 2 ** attempt + random.uniform(0, 0.25)
+
+
+def _call_with_backoff(
+    fn: Callable[..., T],
+    *args: Any,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base: float = DEFAULT_BACKOFF_BASE,
+    **kwargs: Any
+) -> T:
+    """
+    Call `fn(*args, **kwargs)`, retrying with exponential backoff on transient errors.
+
+    Rate limits, connection errors, timeouts and 408 / 409 / 5xx responses are retried;
+    any other error is raised immediately.
+
+    Args:
+        fn (callable): The function to call (e.g. client.embeddings.create).
+        max_retries (int): Maximum number of retries before the error is raised.
+        base (float): Base delay in seconds for the exponential backoff.
+
+    Returns:
+        The return value of `fn`.
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                raise
+            delay = _backoff_delay(e, attempt, base)
+            logging.warning(f"[WARNING] Transient OpenAI error ({e}). Retrying in {delay:.2f}s ({attempt+1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def _acall_with_backoff(
+    fn: Callable[..., Awaitable[T]],
+    *args: Any,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base: float = DEFAULT_BACKOFF_BASE,
+    **kwargs: Any
+) -> T:
+    """
+    Async counterpart of _call_with_backoff: awaits `fn(*args, **kwargs)` and retries
+    transient errors without blocking the event loop.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                raise
+            delay = _backoff_delay(e, attempt, base)
+            logging.warning(f"[WARNING] Transient OpenAI error ({e}). Retrying in {delay:.2f}s ({attempt+1}/{max_retries})")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _max_concurrency() -> int:
+    """
+    Read the maximum number of in-flight embedding requests from the environment.
+
+    OPENAI_MAX_CONCURRENCY sets the limit directly; otherwise OPENAI_USAGE_TIER ("tier1" to
+    "tier5") selects it from USAGE_TIER_CONCURRENCY.
+
+    Returns:
+        int: The configured limit, or DEFAULT_MAX_CONCURRENCY if neither is set or valid.
+    """
+    value = os.getenv("OPENAI_MAX_CONCURRENCY")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            logging.warning(f"[WARNING] Invalid OPENAI_MAX_CONCURRENCY '{value}', ignoring it")
+
+    tier = os.getenv("OPENAI_USAGE_TIER")
+    if tier:
+        if tier.lower() in USAGE_TIER_CONCURRENCY:
+            return USAGE_TIER_CONCURRENCY[tier.lower()]
+        logging.warning(f"[WARNING] Unknown OPENAI_USAGE_TIER '{tier}', expected one of {list(USAGE_TIER_CONCURRENCY)}")
+
+    return DEFAULT_MAX_CONCURRENCY
+
+
+async def _aembed_batch(
+    aclient: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    batch: List[str],
+    start: int,
+    batch_idx: int,
+    total_batches: int,
+    total_chunks: int
+) -> List[Optional[List[float]]]:
+    """
+    Embed one batch of chunks, falling back to one request per chunk if the batch fails.
+
+    Args:
+        aclient (AsyncOpenAI): Async OpenAI client used for the requests.
+        semaphore (asyncio.Semaphore): Limits how many requests are in flight at once.
+        batch (list of str): The chunks of this batch.
+        start (int): Position of the first chunk of the batch in the full chunk list.
+        batch_idx (int): 1-based number of the batch, used for logging.
+        total_batches (int): Total number of batches, used for logging.
+        total_chunks (int): Total number of chunks, used for logging.
+
+    Returns:
+        list: Embedding vectors for the batch, in order. Failed chunks return None in their place.
+    """
+    await asyncio.sleep(random.uniform(0, SUBMIT_JITTER_SECONDS))
+    async with semaphore:
+        # Per-batch and per-chunk progress is DEBUG only; a single INFO line is logged per finished batch
+        logging.debug("[DEBUG] Processing batch %d/%d (chunks %d-%d/%d)", batch_idx, total_batches, start + 1, start + len(batch), total_chunks)
+        try:
+            response = await _acall_with_backoff(aclient.embeddings.create, model=EMBEDDING_MODEL, input=batch)
+            # The API returns one item per input; sort by index to be safe about ordering
+            embeddings: List[Optional[List[float]]] = [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+            logging.info("[INFO] Embedded batch %d/%d (%d chunks)", batch_idx, total_batches, len(batch))
+            return embeddings
+        except Exception as e:
+            logging.error(f"[ERROR] failed to embed batch {batch_idx}: {e}. Retrying its chunks one by one.")
+
+        embeddings = []
+        for offset, chunk in enumerate(batch):
+            logging.debug("[DEBUG] Processing chunk %d/%d", start + offset + 1, total_chunks)
+            try:
+                response = await _acall_with_backoff(aclient.embeddings.create, model=EMBEDDING_MODEL, input=chunk)
+                embeddings.append(response.data[0].embedding)
+            except Exception as item_error:
+                logging.error(f"[ERROR] failed to embed chunk {start+offset+1}: {item_error}")
+                embeddings.append(None)
+        logging.info("[INFO] Embedded batch %d/%d (%d chunks, one by one)", batch_idx, total_batches, len(batch))
+        return embeddings
+
+
+async def _aget_embeddings(chunks: List[str], batch_size: int, max_concurrent: int) -> List[Optional[List[float]]]:
+    """
+    Embed all chunks, running up to `max_concurrent` batch requests at the same time.
+
+    Args:
+        chunks (list of str): A list of text strings to be converted into embeddings.
+        batch_size (int): Maximum number of chunks sent in a single API request.
+        max_concurrent (int): Maximum number of requests in flight at once.
 
-def get_embeddings(chunks: List[str]) -> List[Optional[List[float]]]:
+    Returns:
+        list: A list of embedding vectors in the same order as `chunks`. Failed chunks return None.
+    """
+    total_batches = math.ceil(len(chunks) / batch_size)
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    # A fresh client per run: its connection pool is bound to the event loop created by asyncio.run.
+    # The pool keeps one reusable connection per concurrent request, so no request waits for
+    # (or re-does DNS / TLS setup for) a new connection.
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=max_concurrent, max_keepalive_connections=max_concurrent)
+    )
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, http_client=http_client) as aclient:
+        tasks = [
+            asyncio.create_task(
+                _aembed_batch(aclient, semaphore, chunks[start:start + batch_size], start, batch_idx, total_batches, len(chunks))
+            )
+            for batch_idx, start in enumerate(range(0, len(chunks), batch_size), 1)
+        ]
+        batches = await asyncio.gather(*tasks)
+
+    # Place each batch at its offset in a preallocated list so the result lines up with `chunks`
+    embeddings: List[Optional[List[float]]] = [None] * len(chunks)
+    for start, batch in zip(range(0, len(chunks), batch_size), batches):
+        embeddings[start:start + len(batch)] = batch
+    return embeddings
+
+
+def _get_embedding_cache() -> Optional[SqliteEmbeddingCache]:
+    """
+    Return the shared on-disk embedding cache, creating it on first use.
+
+    Returns:
+        SqliteEmbeddingCache or None: The cache, or None if it could not be opened.
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        try:
+            _embedding_cache = SqliteEmbeddingCache(DEFAULT_CACHE_PATH)
+        except Exception as e:
+            logging.warning(f"[WARNING] Embedding cache unavailable, continuing without it: {e}")
+    return _embedding_cache
+
+
+def get_embeddings(
+    chunks: List[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrent: Optional[int] = None,
+    use_cache: bool = True
+) -> List[Optional[List[float]]]:
     """
     Generate embedding vectors for a list of text chunks using OpenAI's embedding API.
 
-    This function sends each chunk of text to the OpenAI API and retrieves its embedding vector.
-    It logs progress and errors, introduces a small delay between requests to prevent rate limits,
-    and counts both successful and failed attempts.
+    Chunks already embedded in a previous run are served from the on-disk cache, and each
+    distinct uncached text is sent to the API only once. Chunks are sent in batches of up to
+    `batch_size` inputs per request, so N chunks cost ceil(N / batch_size) round-trips instead
+    of N, and up to `max_concurrent` batches are in flight at the same time. If a whole batch
+    fails, its chunks are retried one by one so that only the chunks that actually fail are
+    left as None. Both successful and failed attempts are counted and logged.
 
     Args:
         chunks (list of str): A list of text strings to be converted into embeddings.
+        batch_size (int): Maximum number of chunks sent in a single API request (OpenAI allows up to 2048).
+        max_concurrent (int, optional): Maximum number of requests in flight at once. Defaults to
+                                        the OPENAI_MAX_CONCURRENCY or OPENAI_USAGE_TIER env var, or 5.
+        use_cache (bool): Whether to read from and write to the on-disk embedding cache.
 
     Returns:
         list: A list of embedding vectors (list of floats). Failed chunks return None in their place.
     """
-    embeddings = []
-    success_count = 0
-    fail_count = 0
+    if max_concurrent is None:
+        max_concurrent = _max_concurrency()
+    if batch_size > MAX_API_BATCH_SIZE:
+        logging.warning(f"[WARNING] batch_size {batch_size} exceeds the API limit, using {MAX_API_BATCH_SIZE}")
+        batch_size = MAX_API_BATCH_SIZE
 
-    for i, chunk in enumerate(chunks):
-        logging.info(f"[INFO] Processing chunk {i+1}/{len(chunks)}")
+    cache = _get_embedding_cache() if use_cache else None
+    cached: List[Optional[List[float]]] = [None] * len(chunks)
+    if cache is not None:
         try:
-            response = client.embeddings.create(model = "text-embedding-ada-002", input = chunk)
-            embedding = response.data[0].embedding
-            embeddings.append(embedding)
-            success_count += 1
+            cached = cache.get_many(EMBEDDING_MODEL, chunks)
+        except Exception as e:
+            logging.warning(f"[WARNING] Failed to read embedding cache: {e}")
 
+    # Only distinct texts that are not cached go to the API
+    missing = list(dict.fromkeys(chunk for chunk, hit in zip(chunks, cached) if hit is None))
+    if cache is not None:
+        logging.info(f"[INFO] Embedding cache hits: {len(chunks) - sum(1 for hit in cached if hit is None)}/{len(chunks)}")
+
+    new_embeddings = asyncio.run(_aget_embeddings(missing, batch_size, max_concurrent)) if missing else []
+
+    if cache is not None and missing:
+        try:
+            cache.put_many(EMBEDDING_MODEL, missing, new_embeddings)
         except Exception as e:
-            logging.error(f"[ERROR] failed to embed chunk {i+1}: {e}")
-            embeddings.append(None)
-            fail_count += 1
+            logging.warning(f"[WARNING] Failed to write embedding cache: {e}")
 
-        time.sleep(0.3)
+    fresh = dict(zip(missing, new_embeddings))
+    embeddings = [hit if hit is not None else fresh[chunk] for chunk, hit in zip(chunks, cached)]
 
-    logging.info(f"[SUMMARY] Successfully embedded: {success_count}")
+    fail_count = sum(1 for e in embeddings if e is None)
+    logging.info(f"[SUMMARY] Successfully embedded: {len(embeddings) - fail_count}")
     logging.info(f"[SUMMARY] Failed to embed: {fail_count}")
 
     return embeddings
 
 
-def get_query_embedding(query: str) -> List[float]:
+QUERY_CACHE_SIZE = 1024
+DEFAULT_QUERY_CACHE_PATH = "data/query_emb_cache.pkl"
+
+# Normalized query -> embedding, least recently used first. Loaded from disk on first use
+# and written back when the process exits.
+_query_cache: "Optional[OrderedDict[str, Tuple[float, ...]]]" = None
+_query_cache_dirty = False
+_query_cache_lock = threading.Lock()
+
+
+def _normalize_query(query: str) -> str:
     """
-    Creates an embedding for the input query string using OpenAI API.
-    
+    Normalize a query so that trivial variations (case, surrounding whitespace) share a cache entry.
+
     Args:
         query (str): The user's query.
 
     Returns:
-        list: The embedding vector of the query.
+        str: The normalized query.
     """
+    return query.strip().lower()
+
+
+def _get_query_cache() -> "OrderedDict[str, Tuple[float, ...]]":
+    """
+    Return the in-memory query cache, loading it from DEFAULT_QUERY_CACHE_PATH on first use.
+    Must be called with _query_cache_lock held.
+
+    Returns:
+        OrderedDict: The query embedding cache.
+    """
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = OrderedDict()
+        if os.path.exists(DEFAULT_QUERY_CACHE_PATH):
+            try:
+                with open(DEFAULT_QUERY_CACHE_PATH, "rb") as f:
+                    _query_cache.update(pickle.load(f))
+                logging.info(f"[INFO] Loaded {len(_query_cache)} cached query embeddings from '{DEFAULT_QUERY_CACHE_PATH}'")
+            except Exception as e:
+                logging.warning(f"[WARNING] Could not load query embedding cache, starting empty: {e}")
+        atexit.register(save_query_cache)
+    return _query_cache
+
+
+def save_query_cache(path: Optional[str] = None) -> None:
+    """
+    Write the query embedding cache to disk if it has changed since it was loaded.
+    Called automatically at interpreter exit once the cache has been used.
+
+    Args:
+        path (str, optional): Destination pickle file. Defaults to DEFAULT_QUERY_CACHE_PATH.
+
+    Returns:
+        None
+    """
+    global _query_cache_dirty
+    path = path or DEFAULT_QUERY_CACHE_PATH
+    with _query_cache_lock:
+        if _query_cache is None or not _query_cache_dirty:
+            return
+        entries = dict(_query_cache)
+        _query_cache_dirty = False
+
     try:
-        response = client.embeddings.create(
-            input=query,
-            model="text-embedding-ada-002"
-        )
-        return response.data[0].embedding
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so an interrupted save never leaves a truncated cache
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logging.info(f"[INFO] Saved {len(entries)} query embeddings to '{path}'")
     except Exception as e:
-        logging.error(f"Error generating query embedding: {e}")
-        raise
+        logging.error(f"[ERROR] Failed to save query embedding cache to '{path}': {e}")
+
+
+def get_query_embeddings(queries: Sequence[str]) -> List[Tuple[float, ...]]:
+    """
+    Creates embeddings for several query strings with at most one OpenAI API call.
+
+    Queries are normalized (stripped and lowercased) and looked up in an LRU cache of the last
+    QUERY_CACHE_SIZE queries, persisted in DEFAULT_QUERY_CACHE_PATH across sessions. All
+    cache misses are embedded together in a single batched request.
+
+    Args:
+        queries (Sequence[str]): The user's queries.
+
+    Returns:
+        list: One embedding vector (tuple, so cached vectors cannot be mutated) per query, in order.
+    """
+    global _query_cache_dirty
+    normalized = [_normalize_query(query) for query in queries]
+
+    found: Dict[str, Tuple[float, ...]] = {}
+    with _query_cache_lock:
+        cache = _get_query_cache()
+        for text in normalized:
+            if text in cache:
+                cache.move_to_end(text)
+                found[text] = cache[text]
+    misses = [text for text in dict.fromkeys(normalized) if text not in found]
+
+    if misses:
+        try:
+            response = _call_with_backoff(
+                client.embeddings.create,
+                input=misses,
+                model=EMBEDDING_MODEL
+            )
+        except Exception as e:
+            logging.error(f"Error generating query embedding: {e}")
+            raise
+
+        with _query_cache_lock:
+            for item in response.data:
+                vector = tuple(item.embedding)
+                found[misses[item.index]] = vector
+                cache[misses[item.index]] = vector
+            while len(cache) > QUERY_CACHE_SIZE:
+                cache.popitem(last=False)
+            _query_cache_dirty = True
+
+    return [found[text] for text in normalized]
+
+
+def get_query_embedding(query: str) -> Tuple[float, ...]:
+    """
+    Creates an embedding for the input query string using OpenAI API.
+
+    Repeated queries are served from the query cache instead of calling the API again
+    (see get_query_embeddings).
+    
+    Args:
+        query (str): The user's query.
+
+    Returns:
+        tuple: The embedding vector of the query.
+    """
+    return get_query_embeddings([query])[0]
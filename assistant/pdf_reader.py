@@ -5,14 +5,22 @@ Handles reading and extracting text from PDF files using PyMuPDF.
 
 Responsibilities:
 - Load PDF documents from file
-- Extract full text from all pages or per page
+- Extract full text from all pages or per page (eagerly or lazily)
+- Extract pages in parallel worker processes for large PDFs
+- Pick parallel or streamed extraction by page count
 
 Technologies:
 - PyMuPDF (fitz) for PDF parsing and text extraction
+- concurrent.futures for process-level parallelism
 """
+import os
 import pymupdf
 import logging
-from typing import Optional, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, List
+
+# Below this many pages, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 32
 
 def load_pdf(file_path: str) -> Optional[pymupdf.Document]:
     """
@@ -46,16 +54,30 @@ def extract_text(doc: Optional[pymupdf.Document]) -> str:
     if doc is None:
         return ""
     try:
-        full_text = ""
-        for page in doc:
-            full_text += page.get_text()  # type: ignore[attr-defined]
-        return full_text
+        return "".join(page.get_text() for page in doc)  # type: ignore[attr-defined]
     except Exception as e:
         logging.error(f"[ERROR] Failed to extract text: {e}")
         return ""
 
 
 
+def iter_page_text(doc: Optional[pymupdf.Document]) -> Iterator[str]:
+    """
+    Lazily yield the text of each page of the PDF, one page at a time.
+
+    Args:
+        doc (PyMuPDF.Document): A loaded PDF document.
+
+    Yields:
+        str: Text of the next page. Nothing is yielded if doc is None.
+    """
+    if doc is None:
+        return
+    for page in doc:  # type: ignore[attr-defined]
+        yield page.get_text()  # type: ignore[attr-defined]
+
+
+
 def extract_text_by_page(doc: Optional[pymupdf.Document]) -> List[str]:
     """
     Extract text from each page of the PDF individually.
@@ -74,4 +96,79 @@ def extract_text_by_page(doc: Optional[pymupdf.Document]) -> List[str]:
         return [page.get_text() for page in doc] # type: ignore[attr-defined]
     except Exception as e:
         logging.error(f"[ERROR] Failed to extract text by page: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """
+    Worker function: extract the text of pages [start, stop) of a PDF.
+
+    PyMuPDF documents cannot be pickled, so each worker opens the file itself.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        start (int): Index of the first page.
+        stop (int): Index one past the last page.
+
+    Returns:
+        list: Text of each page in the range, in order.
+    """
+    with pymupdf.open(file_path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)] # type: ignore[attr-defined]
+
+
+def extract_text_by_page_parallel(file_path: str, workers: Optional[int] = None) -> List[str]:
+    """
+    Extract text from each page of the PDF using a pool of worker processes.
+
+    The pages are split into one contiguous range per worker, so every worker opens
+    the PDF only once. Results are returned in page order.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+
+    Returns:
+        list: A list of strings, each representing text from one page.
+              Returns an empty list if the PDF cannot be opened or extraction fails.
+    """
+    try:
+        with pymupdf.open(file_path) as doc:
+            page_count = len(doc)
+    except Exception as e:
+        logging.error(f"[ERROR] Can not open PDF {e}")
+        return []
+    if page_count == 0:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, page_count))
+    step = -(-page_count // workers)  # ceil division
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+            return [text for future in futures for text in future.result()]
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to extract text by page in parallel: {e}")
+        return []
+
+
+def iter_pdf_pages(pdf_path: str, doc: pymupdf.Document) -> Iterable[str]:
+    """
+    Return the text of each page, choosing the extraction strategy by the size of the PDF.
+
+    Large PDFs (more than PARALLEL_MIN_PAGES pages) are extracted in parallel up front;
+    smaller ones are streamed page by page from the already opened document.
+
+    Args:
+        pdf_path (str): Path to the PDF file, reopened by the worker processes.
+        doc (PyMuPDF.Document): The loaded PDF document.
+
+    Returns:
+        Iterable[str]: Text of each page, in page order.
+    """
+    if len(doc) > PARALLEL_MIN_PAGES:
+        return extract_text_by_page_parallel(pdf_path)
+    return iter_page_text(doc)
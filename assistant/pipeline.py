@@ -0,0 +1,167 @@
+"""
+pipeline.py
+
+Streaming PDF-to-vector-store pipeline.
+
+Processes a document as a stream: page text -> clean -> split -> batched embeddings -> FAISS,
+so only the current page, a small chunk buffer and one batch of embeddings are held in memory
+at a time instead of the full text, the full chunk list and all embeddings at once. Embedding
+requests also start as soon as the first batch of chunks is ready.
+
+Responsibilities:
+- Turn a stream of page texts into overlapping chunks across page boundaries
+- Embed chunks in batches and add them to a FAISS index incrementally
+- Save the index and the metadata of every successfully embedded chunk
+
+Technologies:
+- FAISS for the vector index
+- NumPy for float32 vector batches
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import faiss
+import numpy as np
+
+from assistant.text_utils import clean_text, split_text_iter
+from assistant.embedding_utils import get_embeddings
+from assistant.vectorstore_utils import Quantize, build_faiss_index, create_faiss_index, save_metadata, write_index
+
+DEFAULT_PIPELINE_BATCH_SIZE = 1024
+
+
+def iter_chunks(pages: Iterable[str], chunk_size: int, overlap: int) -> Iterator[str]:
+    """
+    Clean each page and yield overlapping chunks across page boundaries.
+
+    A sliding buffer keeps only the text that later chunks still need, so the chunks
+    are the same as split_text on the non-empty cleaned pages joined with newlines.
+
+    Only as much text is held in memory as `pages` provides at once: pdf_reader.iter_pdf_pages
+    streams pages from PDFs of up to PARALLEL_MIN_PAGES pages, but extracts every page of a
+    larger PDF up front, so large PDFs are not streamed.
+
+    Args:
+        pages (Iterable[str]): Raw text of each page, in order.
+        chunk_size (int): Maximum number of characters per chunk.
+        overlap (int): Number of characters to repeat between chunks. Must be smaller than chunk_size.
+
+    Yields:
+        str: The next text chunk.
+    """
+    stride = chunk_size - overlap
+    if stride <= 0:
+        logging.error(f"[ERROR] Failed to split text into chunks: overlap ({overlap}) must be smaller than chunk_size ({chunk_size})")
+        return
+
+    buffer = ""
+    started = False  # the buffer can be empty after a page that ended on a chunk boundary
+    for page in pages:
+        cleaned = clean_text(page)
+        if not cleaned:
+            continue
+        buffer = f"{buffer}\n{cleaned}" if started else cleaned
+        started = True
+
+        start = 0
+        while len(buffer) - start >= chunk_size:
+            yield buffer[start:start + chunk_size]
+            start += stride
+        buffer = buffer[start:]
+
+    yield from split_text_iter(buffer, chunk_size, overlap)
+
+
+def pipeline(
+    pages: Iterable[str],
+    index_path: str,
+    metadata_path: str,
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    batch_size: int = DEFAULT_PIPELINE_BATCH_SIZE,
+    index_type: str = "flat",
+    quantize: Quantize = "none",
+    extra_metadata: Optional[Dict[str, Any]] = None
+) -> Optional[faiss.Index]:
+    """
+    Build and save a FAISS index and metadata store from a stream of page texts.
+
+    Chunks are embedded `batch_size` at a time and added to the index as each batch completes.
+    An int8-quantized index is trained on the first batch. IVFPQ needs a large training set,
+    so for "ivfpq" and "ivfpq_fs" the vectors are collected and the index is built once all chunks are embedded.
+
+    Args:
+        pages (Iterable[str]): Raw text of each page, e.g. from pdf_reader.iter_page_text.
+        index_path (str): Output path for the FAISS index.
+        metadata_path (str): Output path for the metadata file (.arrow / .feather for Arrow, otherwise pickle).
+        chunk_size (int): Number of characters per text chunk.
+        chunk_overlap (int): Number of overlapping characters between chunks.
+        batch_size (int): Number of chunks embedded per get_embeddings call.
+        index_type (str): FAISS index type: "flat", "hnsw", "ivfpq" or "ivfpq_fs" (see build_faiss_index).
+        quantize (str): Storage precision of the indexed vectors: "none", "fp16" or "int8".
+        extra_metadata (dict, optional): Fields added to every chunk's metadata (e.g. filename, course).
+
+    Returns:
+        faiss.Index or None: The saved index, or None if no chunk could be embedded or saving failed.
+    """
+    streaming = index_type in ("flat", "hnsw")
+    index: Optional[faiss.Index] = None
+    pending_vectors: List[np.ndarray] = []
+    metadata: Dict[int, Dict[str, Any]] = {}
+    total_chunks = 0
+
+    def flush(batch: List[str]) -> None:
+        nonlocal index
+        embeddings = get_embeddings(batch)
+        valid = [(chunk, e) for chunk, e in zip(batch, embeddings) if e is not None]
+        if not valid:
+            return
+
+        vectors = np.asarray([e for _, e in valid], dtype=np.float32)
+        if streaming:
+            faiss.normalize_L2(vectors)
+            if index is None:
+                index = create_faiss_index(vectors.shape[1], index_type, quantize=quantize)
+                if not index.is_trained:
+                    index.train(vectors)  # type: ignore[arg-type]
+            index.add(vectors)  # type: ignore[arg-type]
+        else:
+            pending_vectors.append(vectors)
+
+        for chunk, _ in valid:
+            chunk_id = len(metadata)
+            metadata[chunk_id] = {"text": chunk, "chunk_id": chunk_id, **(extra_metadata or {})}
+
+    try:
+        batch: List[str] = []
+        for chunk in iter_chunks(pages, chunk_size, chunk_overlap):
+            batch.append(chunk)
+            total_chunks += 1
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+                logging.info(f"[INFO] Pipeline progress: {total_chunks} chunks processed, {len(metadata)} embedded")
+        if batch:
+            flush(batch)
+
+        logging.info(f"[INFO] Pipeline finished: {len(metadata)}/{total_chunks} chunks embedded")
+        if not metadata:
+            logging.error("[ERROR] No valid embeddings were generated.")
+            return None
+
+        if streaming:
+            assert index is not None  # created by the first flush that embedded anything
+            write_index(index, index_path)
+            logging.info(f"[INFO] FAISS index saved to '{index_path}'")
+        else:
+            index = build_faiss_index(np.concatenate(pending_vectors), save_path=index_path, index_type=index_type, quantize=quantize)
+            if index is None:
+                return None
+
+        save_metadata(metadata, path=metadata_path)
+        return index
+
+    except Exception as e:
+        logging.error(f"[ERROR] Pipeline failed: {e}")
+        return None
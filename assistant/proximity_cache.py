@@ -0,0 +1,151 @@
+"""
+proximity_cache.py
+
+Semantic (similarity-based) cache for search results.
+
+Stores the embeddings of recent queries together with the results returned for them.
+When a new query embedding is close enough (cosine similarity >= threshold) to a cached one,
+the cached results are returned and both the FAISS search and its post-processing are skipped,
+so repeats of a question are served from memory.
+
+The cache is opt-in: search_engine only uses it when PROXIMITY_CACHE_THRESHOLD is set.
+text-embedding-ada-002 cosine scores mostly fall between 0.7 and 1.0, so with a loose
+threshold a different question on the same topic would get another question's chunks;
+keep it at near-duplicate level.
+
+Responsibilities:
+- Keep a small inner-product FAISS index of L2-normalized query embeddings
+- Return stored results for near-duplicate queries
+- Evict the least recently used entry when the cache is full
+
+Technologies:
+- FAISS (IndexFlatIP) for nearest-neighbour lookup among cached queries
+- NumPy for vector handling
+"""
+
+import os
+import logging
+import threading
+from typing import List, Dict, Optional
+
+import faiss
+import numpy as np
+
+DEFAULT_CAPACITY = 256
+DEFAULT_THRESHOLD = 0.97  # near-duplicates only
+
+
+def cache_enabled() -> bool:
+    """
+    Check whether the semantic cache is enabled, i.e. the PROXIMITY_CACHE_THRESHOLD env var is set.
+
+    Returns:
+        bool: True if PROXIMITY_CACHE_THRESHOLD is set to a non-empty value.
+    """
+    return bool(os.getenv("PROXIMITY_CACHE_THRESHOLD"))
+
+
+def default_threshold() -> float:
+    """
+    Read the similarity threshold from the PROXIMITY_CACHE_THRESHOLD env var.
+
+    Returns:
+        float: The configured threshold, or DEFAULT_THRESHOLD if unset or invalid.
+    """
+    value = os.getenv("PROXIMITY_CACHE_THRESHOLD")
+    if not value:
+        return DEFAULT_THRESHOLD
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning(f"[WARNING] Invalid PROXIMITY_CACHE_THRESHOLD '{value}', using {DEFAULT_THRESHOLD}")
+        return DEFAULT_THRESHOLD
+
+
+class ProximityCache:
+    """
+    LRU cache of search results keyed by query embedding, matched by cosine similarity.
+
+    Query vectors passed to `lookup` and `insert` must already be L2-normalized with shape (1, d).
+    All operations are guarded by a lock so one cache can be shared between request threads.
+    """
+
+    def __init__(self, dimension: int, capacity: int = DEFAULT_CAPACITY, threshold: Optional[float] = None) -> None:
+        """
+        Args:
+            dimension (int): Dimension of the query embeddings.
+            capacity (int): Maximum number of cached queries.
+            threshold (float, optional): Minimum cosine similarity for a hit.
+                                         Defaults to the PROXIMITY_CACHE_THRESHOLD env var, or 0.97.
+        """
+        self.capacity = capacity
+        self.threshold = default_threshold() if threshold is None else threshold
+        self._index = faiss.IndexFlatIP(dimension)
+        # Parallel to the rows of self._index
+        self._results: List[List[Dict]] = []
+        self._last_used: List[int] = []
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def lookup(self, query_vector: np.ndarray) -> Optional[List[Dict]]:
+        """
+        Return the results stored for the most similar cached query, if it is similar enough.
+
+        Args:
+            query_vector (np.ndarray): L2-normalized query embedding of shape (1, d).
+
+        Returns:
+            List[Dict] or None: Copies of the cached results on a hit, otherwise None.
+        """
+        with self._lock:
+            if not self._results:
+                return None
+
+            scores, positions = self._index.search(query_vector, 1)  # type: ignore
+            score, position = float(scores[0][0]), int(positions[0][0])
+            if position < 0 or score < self.threshold:
+                return None
+
+            self._clock += 1
+            self._last_used[position] = self._clock
+            logging.info(f"[INFO] Proximity cache hit (similarity {score:.4f})")
+            return [result.copy() for result in self._results[position]]
+
+    def insert(self, query_vector: np.ndarray, results: List[Dict]) -> None:
+        """
+        Store the results of a query, evicting the least recently used entry if the cache is full.
+
+        Args:
+            query_vector (np.ndarray): L2-normalized query embedding of shape (1, d).
+            results (List[Dict]): The search results for this query.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if len(self._results) >= self.capacity:
+                oldest = min(range(len(self._last_used)), key=self._last_used.__getitem__)
+                # IndexFlat.remove_ids shifts later rows down, which matches deleting from the lists
+                self._index.remove_ids(np.array([oldest], dtype=np.int64))  # type: ignore[arg-type]
+                del self._results[oldest]
+                del self._last_used[oldest]
+
+            self._clock += 1
+            self._index.add(query_vector)  # type: ignore
+            self._results.append([result.copy() for result in results])
+            self._last_used.append(self._clock)
+
+    def clear(self) -> None:
+        """
+        Remove all cached entries.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._index.reset()
+            self._results.clear()
+            self._last_used.clear()
@@ -7,90 +7,614 @@ creates embeddings for user queries, and performs vector-based similarity search
 to retrieve the most relevant text chunks.
 
 Functions:
-- load_index_and_metadata: Load FAISS index and metadata from disk.
+- load_index_and_metadata: Load FAISS index and metadata from disk (optionally onto the GPU).
+- get_index_and_metadata: Cached load_index_and_metadata, reloaded when the files change on disk.
+- clear_index_cache: Drop all cached indexes (e.g. after rebuilding a vector store).
+- move_index_to_gpu: Copy a FAISS index to the available GPU(s).
+- move_index_to_cuvs: Move a FAISS index to a cuVS GPU index (CAGRA graph or cuVS IVF).
 - search_similar_chunks: Search for top-k most relevant text chunks based on query embedding.
+  Results for near-duplicate queries can be served from an opt-in semantic cache (see proximity_cache.py).
+  Concurrent searches are micro-batched into a single index.search call.
+- search_similar_chunks_batch: Search for several queries with one embedding request and one index.search.
+- generate_answer_from_chunks / stream_answer_from_chunks: Answer a query with GPT from the retrieved chunks,
+  either as one string or streamed as it is generated.
 """
 
+import os
 import faiss
 import pickle
+import queue
+import threading
+import time
 import numpy as np
 import logging
-from typing import List, Tuple, Dict, cast, Optional, Any
-from openai import OpenAI
-from assistant.embedding_utils import get_query_embedding
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import List, Tuple, Dict, Iterator, Mapping, cast, Optional, Any
+from openai import OpenAI, Stream
+from openai.types.chat import ChatCompletionChunk
+from assistant.embedding_utils import get_query_embedding, get_query_embeddings, _normalize_query
+from assistant.proximity_cache import ProximityCache, cache_enabled
+from assistant.vectorstore_utils import METADATA_BUFFER_SIZE
+from assistant.arrow_metadata import ArrowMetadata, is_arrow_path
 
 client = OpenAI()
 
+IVF_NPROBE = 16
+ANSWER_ERROR_MESSAGE = "Σφάλμα κατά τη δημιουργία απάντησης."
+PREVIEW_CHARS = 300  # length of the "preview" field of every search result
 
-def load_index_and_metadata(index_path: str, metadata_path: str) -> Tuple[faiss.Index, Dict[int, Dict]]:
+# IO_FLAG_MMAP_IFC (newer FAISS) also maps the codes of flat and scalar-quantized indexes,
+# IO_FLAG_MMAP only the inverted lists of IVF indexes
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+REFINE_K_FACTOR = 4  # refine indexes re-rank top_k * REFINE_K_FACTOR candidates exactly
+
+# Micro-batching of concurrent searches: how long to wait for more queries, and how many to stack
+BATCH_WINDOW_SECONDS = 0.005
+MAX_SEARCH_BATCH = 32
+
+# One semantic cache per (index, top_k). The index object is kept alongside its cache so
+# its id() cannot be reused by a different index while the entry exists.
+_MAX_PROXIMITY_CACHES = 16
+_proximity_caches: "OrderedDict[Tuple[int, int], Tuple[faiss.Index, ProximityCache]]" = OrderedDict()
+_proximity_caches_lock = threading.Lock()
+
+
+# Created on first use and shared by every GPU index: initializing GPU resources is expensive
+_gpu_resources: Optional[Any] = None
+_gpu_resources_lock = threading.Lock()
+
+
+def _get_gpu_resources() -> Any:
+    """
+    Return the process-wide faiss.StandardGpuResources, creating it on first use.
+
+    Returns:
+        faiss.StandardGpuResources: The shared GPU resources.
+    """
+    global _gpu_resources
+    with _gpu_resources_lock:
+        if _gpu_resources is None:
+            _gpu_resources = faiss.StandardGpuResources()
+        return _gpu_resources
+
+
+def move_index_to_gpu(index: faiss.Index) -> faiss.Index:
+    """
+    Copy a CPU FAISS index to the GPU(s), falling back to the CPU index if that is not possible.
+
+    A single GPU uses the shared StandardGpuResources; with several GPUs the index is
+    spread over all of them. Requires a GPU build of FAISS (faiss-gpu); index types
+    without a GPU implementation (e.g. HNSW) stay on the CPU.
+
+    Args:
+        index (faiss.Index): A CPU index. GPU indexes are returned unchanged.
+
+    Returns:
+        faiss.Index: The GPU index, or the original index if it could not be moved.
+    """
+    if type(index).__name__.startswith("Gpu"):
+        return index
+
+    num_gpus = faiss.get_num_gpus() if hasattr(faiss, "get_num_gpus") else 0
+    if num_gpus == 0 or not hasattr(faiss, "StandardGpuResources"):
+        logging.warning("[WARNING] No GPU available to FAISS, keeping the index on CPU.")
+        return index
+
+    try:
+        if num_gpus > 1:
+            gpu_index = faiss.index_cpu_to_all_gpus(index)
+        else:
+            gpu_index = faiss.index_cpu_to_gpu(_get_gpu_resources(), 0, index)
+        logging.info(f"[INFO] FAISS index moved to {num_gpus} GPU(s).")
+        return gpu_index
+    except Exception as e:
+        logging.warning(f"[WARNING] Could not move FAISS index to GPU, keeping it on CPU: {e}")
+        return index
+
+
+def move_index_to_cuvs(index: faiss.Index) -> faiss.Index:
+    """
+    Move a CPU FAISS index to a cuVS-backed GPU index (NVIDIA RAPIDS).
+
+    IVF indexes are cloned to the GPU with use_cuvs=True; flat and HNSW indexes are rebuilt
+    as a CAGRA graph index from their stored vectors, which suits read-mostly search.
+    Requires FAISS built with cuVS (FAISS_ENABLE_CUVS=ON, e.g. the faiss-gpu-cuvs conda package).
+    Falls back to move_index_to_gpu, and from there to the CPU, if this is not possible.
+
+    Args:
+        index (faiss.Index): A CPU index.
+
+    Returns:
+        faiss.Index: The cuVS GPU index, or the result of move_index_to_gpu on failure.
+    """
+    num_gpus = faiss.get_num_gpus() if hasattr(faiss, "get_num_gpus") else 0
+    if num_gpus == 0 or not hasattr(faiss, "GpuIndexCagra"):
+        logging.warning("[WARNING] FAISS has no cuVS support or no GPU is available, not using cuVS.")
+        return move_index_to_gpu(index)
+
+    try:
+        if faiss.try_extract_index_ivf(index) is not None:
+            options = faiss.GpuClonerOptions()
+            options.use_cuvs = True
+            gpu_index = faiss.index_cpu_to_gpu(_get_gpu_resources(), 0, index, options)
+        else:
+            # CAGRA builds its graph from the raw vectors when it is trained
+            vectors = index.reconstruct_n(0, index.ntotal)
+            gpu_index = faiss.GpuIndexCagra(_get_gpu_resources(), index.d, index.metric_type, faiss.GpuIndexCagraConfig())  # type: ignore[attr-defined]
+            gpu_index.train(vectors)
+        logging.info(f"[INFO] FAISS index moved to a cuVS {type(gpu_index).__name__}.")
+        return gpu_index
+    except Exception as e:
+        logging.warning(f"[WARNING] Could not build a cuVS index, using the standard GPU path: {e}")
+        return move_index_to_gpu(index)
+
+
+def _resolve_metadata_path(metadata_path: str) -> str:
+    """
+    Fall back to the pickle sibling of an Arrow metadata path that does not exist.
+
+    Vector stores built before metadata was saved as Arrow only have a {course}_metadata.pkl file.
+
+    Args:
+        metadata_path (str): Requested metadata path.
+
+    Returns:
+        str: metadata_path, or its .pkl sibling if only that exists.
+    """
+    if is_arrow_path(metadata_path) and not os.path.exists(metadata_path):
+        pickle_path = os.path.splitext(metadata_path)[0] + ".pkl"
+        if os.path.exists(pickle_path):
+            logging.info(f"[INFO] {metadata_path} not found, loading pickle metadata from {pickle_path}")
+            return pickle_path
+    return metadata_path
+
+
+def load_index_and_metadata(index_path: str, metadata_path: str, mmap: bool = True) -> Tuple[faiss.Index, Mapping[int, Dict]]:
     """
     Load the FAISS index and metadata from disk.
 
+    By default the index file is memory-mapped read-only instead of being read into memory:
+    loading takes constant time and only the pages that searches touch (e.g. the probed
+    inverted lists of an IVF index) are read from disk. The returned index cannot be modified.
+
+    If the FAISS_USE_GPU env var is "1" and a GPU is available, the index is moved to the GPU;
+    with ENGINE=cuvs it is moved to a cuVS GPU index instead (see move_index_to_cuvs).
+    Pickled metadata records get a "preview" field with the first PREVIEW_CHARS characters of
+    their text; Arrow rows get it when a search returns them (see _to_results).
+
     Args:
         index_path (str): Path to the FAISS index file.
-        metadata_path (str): Path to the metadata pickle file.
+        metadata_path (str): Path to the metadata pickle file, or an Arrow (.arrow / .feather) file,
+                             which is memory-mapped and returned as an ArrowMetadata mapping.
+                             A missing Arrow file falls back to the .pkl file of the same name.
+        mmap (bool): Memory-map the index instead of reading it fully into memory.
 
     Returns:
-        Tuple[faiss.Index, Dict[int, Dict]]: The loaded FAISS index and metadata dictionary.
+        Tuple[faiss.Index, Mapping[int, Dict]]: The loaded FAISS index and metadata dictionary.
     """
     try:
-        index = faiss.read_index(index_path)
+        index = faiss.read_index(index_path, _MMAP_FLAGS) if mmap else faiss.read_index(index_path)
     except Exception as e:
         logging.error(f"Failed to load FAISS index from {index_path}: {e}")
         raise
 
+    metadata_path = _resolve_metadata_path(metadata_path)
+
+    if index.metric_type == faiss.METRIC_L2:
+        logging.warning(
+            f"{index_path} uses the L2 metric: scores are distances (lower is better), not cosine similarities. "
+            "Rebuild the vector store to get an inner-product index."
+        )
+
+    if os.getenv("ENGINE", "").lower() == "cuvs":
+        index = move_index_to_cuvs(index)
+    elif os.getenv("FAISS_USE_GPU") == "1":
+        index = move_index_to_gpu(index)
+
     try:
-        with open(metadata_path, "rb") as f:
-            metadata = pickle.load(f)
+        if is_arrow_path(metadata_path):
+            metadata: Mapping[int, Dict] = ArrowMetadata.open(metadata_path)
+        else:
+            with open(metadata_path, "rb", buffering=METADATA_BUFFER_SIZE) as f:
+                metadata = pickle.load(f)
     except Exception as e:
         logging.error(f"Failed to load metadata from {metadata_path}: {e}")
         raise
 
+    # Slice the text previews shown with search results once, instead of on every result.
+    # Arrow metadata stays memory-mapped: its previews are sliced in _to_results for the hit rows only
+    if not isinstance(metadata, ArrowMetadata):
+        for record in metadata.values():
+            if "text" in record:
+                record["preview"] = record["text"][:PREVIEW_CHARS]
+
     return index, metadata
 
 
-def search_similar_chunks(query: str, index: faiss.Index, metadata: Dict[int, Dict], top_k: int = 5) -> List[Dict]:
+# (index_path, metadata_path) -> ((index_mtime, metadata_mtime), (index, metadata)).
+# One entry per store: a rebuilt store replaces its entry, releasing the old index and mappings
+_index_cache: Dict[Tuple[str, str], Tuple[Tuple[float, float], Tuple[faiss.Index, Mapping[int, Dict]]]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def get_index_and_metadata(index_path: str, metadata_path: str) -> Tuple[faiss.Index, Mapping[int, Dict]]:
+    """
+    Return the FAISS index and metadata, loading them from disk only on first use.
+
+    Entries are keyed by the paths of both files and reloaded when either modification time
+    changes, so an index rebuilt by another process (e.g. scripts/build_vectorstore.py) is
+    picked up on the next call. The returned objects are shared between callers and must not be modified.
+
+    Args:
+        index_path (str): Path to the FAISS index file.
+        metadata_path (str): Path to the metadata file (see load_index_and_metadata).
+
+    Returns:
+        Tuple[faiss.Index, Mapping[int, Dict]]: The loaded FAISS index and metadata dictionary.
+    """
+    metadata_path = _resolve_metadata_path(metadata_path)
+    try:
+        index_mtime = os.path.getmtime(index_path)
+        metadata_mtime = os.path.getmtime(metadata_path)
+    except OSError as e:
+        logging.error(f"Failed to stat vector store files {index_path}, {metadata_path}: {e}")
+        raise
+
+    key = (index_path, metadata_path)
+    mtimes = (index_mtime, metadata_mtime)
+    with _index_cache_lock:
+        entry = _index_cache.get(key)
+        if entry is not None and entry[0] == mtimes:
+            return entry[1]
+
+        loaded = load_index_and_metadata(index_path, metadata_path)
+        _index_cache[key] = (mtimes, loaded)
+        if entry is not None:
+            # The semantic caches of the replaced index hold it alive (and its results are stale)
+            _drop_proximity_caches(entry[1][0])
+        return loaded
+
+
+def clear_index_cache() -> None:
+    """
+    Drop every index and metadata store cached by get_index_and_metadata, and every semantic cache.
+
+    Returns:
+        None
+    """
+    with _index_cache_lock:
+        _index_cache.clear()
+    with _proximity_caches_lock:
+        _proximity_caches.clear()
+
+
+def _configure_search(index: faiss.Index, top_k: int) -> None:
+    """
+    Set query-time search parameters for index types that have them.
+
+    Args:
+        index (faiss.Index): The FAISS index about to be searched.
+        top_k (int): Number of results requested.
+
+    Returns:
+        None
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        # Larger efSearch = better recall, slower search; scale it with the number of results
+        index.hnsw.efSearch = max(64, top_k * 8)
+    elif hasattr(index, "nprobe"):
+        # Number of inverted lists visited per query (CPU IndexIVF or GpuIndexIVF)
+        index.nprobe = IVF_NPROBE
+    else:
+        # IVF wrapped in a pre-transform (OPQ) or refine stage keeps nprobe on the inner index
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = IVF_NPROBE
+
+    if isinstance(index, faiss.IndexRefine):
+        index.k_factor = REFINE_K_FACTOR
+
+
+def _get_proximity_cache(index: faiss.Index, top_k: int) -> ProximityCache:
+    """
+    Return the semantic cache for an index and result size, creating it if needed.
+
+    Args:
+        index (faiss.Index): The FAISS index being searched.
+        top_k (int): Number of results per query.
+
+    Returns:
+        ProximityCache: The cache for this (index, top_k) pair.
+    """
+    key = (id(index), top_k)
+    with _proximity_caches_lock:
+        entry = _proximity_caches.get(key)
+        if entry is None:
+            entry = (index, ProximityCache(index.d))
+            _proximity_caches[key] = entry
+            if len(_proximity_caches) > _MAX_PROXIMITY_CACHES:
+                _proximity_caches.popitem(last=False)
+        else:
+            _proximity_caches.move_to_end(key)
+        return entry[1]
+
+
+def _drop_proximity_caches(index: faiss.Index) -> None:
+    """
+    Remove the semantic caches of an index, releasing the reference they keep to it.
+
+    Args:
+        index (faiss.Index): The index whose caches are dropped.
+
+    Returns:
+        None
+    """
+    with _proximity_caches_lock:
+        for key in [key for key, (cached_index, _) in _proximity_caches.items() if cached_index is index]:
+            del _proximity_caches[key]
+
+
+class _SearchBatcher:
+    """
+    Collects concurrent search requests and answers them with one index.search per batch.
+
+    FAISS processes a (B, d) query matrix in a single pass, which is much cheaper than B
+    searches of shape (1, d). Callers block in `search` while a background thread waits up to
+    `window` seconds for more queries, groups them by (index, top_k) and runs one search per group.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW_SECONDS, max_batch: int = MAX_SEARCH_BATCH) -> None:
+        """
+        Args:
+            window (float): Seconds to wait for more queries after the first one arrives.
+            max_batch (int): Maximum number of queries searched together.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[faiss.Index, np.ndarray, int, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def search(self, index: faiss.Index, query_vector: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the index for one query as part of the next batch.
+
+        Args:
+            index (faiss.Index): The FAISS index to search.
+            query_vector (np.ndarray): Query embedding of shape (1, d).
+            top_k (int): Number of results to return.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distances and indices, each of shape (1, top_k).
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((index, query_vector, top_k, future))
+        return future.result()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="faiss-search-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups: Dict[Tuple[int, int], List[Tuple[faiss.Index, np.ndarray, int, Future]]] = defaultdict(list)
+            for request in pending:
+                index, _, top_k, _ = request
+                groups[(id(index), top_k)].append(request)
+
+            for requests in groups.values():
+                self._search_group(requests)
+
+    @staticmethod
+    def _search_group(requests: List[Tuple[faiss.Index, np.ndarray, int, Future]]) -> None:
+        index, _, top_k, _ = requests[0]
+        try:
+            stacked = np.vstack([query_vector for _, query_vector, _, _ in requests])
+            _configure_search(index, top_k)
+            distances, indices = index.search(stacked, top_k)  # type: ignore
+        except Exception as e:
+            for *_, future in requests:
+                future.set_exception(e)
+            return
+
+        if len(requests) > 1:
+            logging.debug(f"Searched {len(requests)} queries in one batch")
+        for row, (*_, future) in enumerate(requests):
+            future.set_result((distances[row:row + 1], indices[row:row + 1]))
+
+
+_batcher = _SearchBatcher()
+
+
+def _to_results(ids: np.ndarray, scores: np.ndarray, metadata: Mapping[int, Dict]) -> List[Dict]:
+    """
+    Turn one row of FAISS search output into result dictionaries.
+
+    Args:
+        ids (np.ndarray): Vector IDs returned by index.search for one query.
+        scores (np.ndarray): The matching distances / similarities.
+        metadata (Mapping[int, Dict]): Mapping of vector IDs to chunk metadata.
+
+    Returns:
+        List[Dict]: Copies of the chunk metadata with "score" and "preview" fields, in rank order.
+    """
+    # FAISS pads with id -1 when fewer than top_k vectors were found; drop those in one step and
+    # convert the rest to Python ints / floats with a single tolist() call each
+    ids = np.asarray(ids)
+    mask = ids >= 0
+    found: List[int] = []
+    found_scores: List[float] = []
+    for i, score in zip(ids[mask].tolist(), np.asarray(scores)[mask].tolist()):
+        if i in metadata:
+            found.append(i)
+            found_scores.append(score)
+        else:
+            logging.warning(f"Vector index {i} not found in metadata.")
+
+    # Arrow metadata materializes only the hit rows, in one call, and slices their previews here
+    if isinstance(metadata, ArrowMetadata):
+        results = metadata.take(found)
+        for result in results:
+            # Missing fields come back as None, so rows without text get an empty preview
+            result["preview"] = (result.get("text") or "")[:PREVIEW_CHARS]
+    else:
+        results = [metadata[i].copy() for i in found]
+    for result, score in zip(results, found_scores):
+        result["score"] = score
+    return results
+
+
+def search_similar_chunks(
+    query: str,
+    index: faiss.Index,
+    metadata: Mapping[int, Dict],
+    top_k: int = 5,
+    use_cache: Optional[bool] = None,
+    batch: bool = True
+) -> List[Dict]:
     """
     Search for the most relevant text chunks given a query using FAISS vector similarity.
 
+    If the semantic cache is enabled and a previous query on the same index has a cosine
+    similarity above the cache threshold with this one, its results are returned without
+    searching the index.
+
     Args:
         query (str): The user's search query.
         index (faiss.Index): Loaded FAISS index.
-        metadata (Dict[int, Dict]): Dictionary mapping vector IDs to chunk metadata.
+        metadata (Mapping[int, Dict]): Mapping of vector IDs to chunk metadata.
         top_k (int): Number of top results to return.
+        use_cache (bool, optional): Whether to use the semantic query cache. Defaults to
+                                    enabled only if PROXIMITY_CACHE_THRESHOLD is set.
+        batch (bool): Whether to batch the search with concurrent queries. Use False to search
+                      the index directly in the calling thread (e.g. in unit tests).
 
     Returns:
-        List[Dict]: List of top-k results with metadata and similarity scores.
+        List[Dict]: List of top-k results with metadata and similarity scores. For
+                    inner-product indexes the score is the cosine similarity in [-1, 1]
+                    (higher is more similar); for L2 indexes it is the squared distance.
     """
     try:
         query_embedding = get_query_embedding(query)
         query_vector = np.array(query_embedding, dtype=np.float32).reshape(1, -1)
+        # Indexes store L2-normalized vectors, so inner product = cosine similarity
+        faiss.normalize_L2(query_vector)
     except Exception as e:
         logging.error(f"Failed to generate query embedding: {e}")
         raise
 
+    if use_cache is None:
+        use_cache = cache_enabled()
+    cache: Optional[ProximityCache] = None
+    if use_cache:
+        cache = _get_proximity_cache(index, top_k)
+        cached_results = cache.lookup(query_vector)
+        if cached_results is not None:
+            return cached_results
+
     try:
-        distances, indices = index.search(query_vector, top_k) # type: ignore
+        if batch:
+            distances, indices = _batcher.search(index, query_vector, top_k)
+        else:
+            _configure_search(index, top_k)
+            distances, indices = index.search(query_vector, top_k) # type: ignore
     except Exception as e:
         logging.error(f"FAISS search failed: {e}")
         raise
 
-    results: List[Dict] = []
-    for i, score in zip(indices[0], distances[0]):
-        if i in metadata:
-            result = metadata[i].copy()
-            result["score"] = float(score)
-            results.append(result)
-        else:
-            logging.warning(f"Vector index {i} not found in metadata.")
+    results = _to_results(indices[0], distances[0], metadata)
+
+    if cache is not None:
+        cache.insert(query_vector, results)
 
     return results
 
 
-def generate_answer_from_chunks(query: str, chunks: List[str], mode: str = "study") -> str:
+def search_similar_chunks_batch(
+    queries: List[str],
+    index: faiss.Index,
+    metadata: Mapping[int, Dict],
+    top_k: int = 5,
+    use_cache: Optional[bool] = None
+) -> List[List[Dict]]:
     """
-    Use OpenAI GPT to generate an answer from a user query and a list of supporting chunks.
-    Adjusts system prompt and behavior based on selected mode (e.g., study, exam, project).
+    Search for several queries at once: one embedding request and one index.search call.
+
+    Stacking the queries into a single (nq, d) matrix lets FAISS search them together,
+    which is much cheaper than nq separate searches.
+
+    Args:
+        queries (List[str]): The user's search queries.
+        index (faiss.Index): Loaded FAISS index.
+        metadata (Mapping[int, Dict]): Mapping of vector IDs to chunk metadata.
+        top_k (int): Number of top results to return per query.
+        use_cache (bool, optional): Whether to use the semantic query cache. Defaults to
+                                    enabled only if PROXIMITY_CACHE_THRESHOLD is set.
+
+    Returns:
+        List[List[Dict]]: The results of each query, in the order of `queries`
+                          (see search_similar_chunks for the result format). Queries that
+                          are equal after normalization share the same result list.
+    """
+    if not queries:
+        return []
+
+    # Repeated queries in one batch are embedded, searched and cached once, then fanned back out
+    keys = [_normalize_query(query) for query in queries]
+    unique = list(dict.fromkeys(keys))
+
+    try:
+        query_vectors = np.ascontiguousarray(get_query_embeddings(unique), dtype=np.float32)
+        faiss.normalize_L2(query_vectors)
+    except Exception as e:
+        logging.error(f"Failed to generate query embeddings: {e}")
+        raise
+
+    if use_cache is None:
+        use_cache = cache_enabled()
+    results: List[Optional[List[Dict]]] = [None] * len(unique)
+    cache = _get_proximity_cache(index, top_k) if use_cache else None
+    if cache is not None:
+        for row in range(len(unique)):
+            results[row] = cache.lookup(query_vectors[row:row + 1])
+
+    misses = [row for row, result in enumerate(results) if result is None]
+    if misses:
+        try:
+            _configure_search(index, top_k)
+            distances, indices = index.search(query_vectors[misses], top_k) # type: ignore
+        except Exception as e:
+            logging.error(f"FAISS search failed: {e}")
+            raise
+
+        for position, row in enumerate(misses):
+            results[row] = _to_results(indices[position], distances[position], metadata)
+            if cache is not None:
+                cache.insert(query_vectors[row:row + 1], results[row])  # type: ignore[arg-type]
+
+    by_key = dict(zip(unique, cast(List[List[Dict]], results)))
+    return [by_key[key] for key in keys]
+
+
+def _build_answer_messages(query: str, chunks: List[str], mode: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for answering a query from its supporting chunks.
+    Adjusts the system prompt based on selected mode (e.g., study, exam, project).
 
     Args:
         query (str): The user's question.
@@ -98,37 +622,96 @@ def generate_answer_from_chunks(query: str, chunks: List[str], mode: str = "stud
         mode (str): Mode of operation: "study", "exam", or "project".
 
     Returns:
-        str: GPT-generated answer.
+        List[Dict[str, str]]: The system and user messages.
+    """
+    context = "\n\n".join(chunks)
+
+    if mode == "exam":
+        system_prompt = "Είσαι αυστηρός καθηγητής και απαντάς σύντομα, με ακρίβεια και μόνο με βάση τις σημειώσεις."
+    elif mode == "project":
+        system_prompt = "Είσαι ένας βοηθός που βοηθάει σε υλοποίηση project. Δώσε τεχνικές και πρακτικές πληροφορίες."
+    else:
+        system_prompt = "Είσαι ένας εκπαιδευτικός βοηθός. Εξήγησε με απλό και φιλικό τρόπο βασισμένος στις σημειώσεις."
+
+    prompt = (
+        f"Χρήστης: {query}\n\n"
+        "Παρακάτω σου δίνω αποσπάσματα από τις σημειώσεις. Χρησιμοποίησέ τα για να απαντήσεις στην ερώτηση:\n\n"
+        f"--- Αποσπάσματα ---\n{context}\n--------------------\n\n"
+        "Παρακαλώ απάντησε όσο πιο ακριβώς γίνεται με βάση τα παραπάνω μόνο."
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _stream_answer_deltas(query: str, chunks: List[str], mode: str) -> Iterator[str]:
+    """
+    Yield the pieces of the GPT answer as they are generated. Errors are raised to the caller.
+
+    Args:
+        query (str): The user's question.
+        chunks (List[str]): List of relevant text chunks from FAISS.
+        mode (str): Mode of operation: "study", "exam", or "project".
+
+    Yields:
+        str: The next piece of the GPT-generated answer.
     """
+    # The messages are plain dicts, so mypy cannot pick the stream=True overload by itself
+    stream = cast(Stream[ChatCompletionChunk], client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=_build_answer_messages(query, chunks, mode),  # type: ignore[arg-type]
+        stream=True
+    ))
+    for event in stream:
+        if event.choices and event.choices[0].delta.content:
+            yield event.choices[0].delta.content
+
+
+def stream_answer_from_chunks(query: str, chunks: List[str], mode: str = "study") -> Iterator[str]:
+    """
+    Use OpenAI GPT to generate an answer from a user query and a list of supporting chunks,
+    yielding the answer text piece by piece as it is generated.
+
+    Args:
+        query (str): The user's question.
+        chunks (List[str]): List of relevant text chunks from FAISS.
+        mode (str): Mode of operation: "study", "exam", or "project".
+
+    Yields:
+        str: The next piece of the GPT-generated answer. If the request fails before anything was
+             generated, an error message is yielded instead; a failure partway through ends the stream.
+    """
+    yielded = False
     try:
-        context = "\n\n".join(chunks)
+        for delta in _stream_answer_deltas(query, chunks, mode):
+            yielded = True
+            yield delta
 
-        if mode == "exam":
-            system_prompt = "Είσαι αυστηρός καθηγητής και απαντάς σύντομα, με ακρίβεια και μόνο με βάση τις σημειώσεις."
-        elif mode == "project":
-            system_prompt = "Είσαι ένας βοηθός που βοηθάει σε υλοποίηση project. Δώσε τεχνικές και πρακτικές πληροφορίες."
+    except Exception as e:
+        if yielded:
+            logging.error(f"Answer stream from GPT failed partway, the answer is incomplete: {e}")
         else:
-            system_prompt = "Είσαι ένας εκπαιδευτικός βοηθός. Εξήγησε με απλό και φιλικό τρόπο βασισμένος στις σημειώσεις."
+            logging.error(f"Failed to generate answer with GPT: {e}")
+            yield ANSWER_ERROR_MESSAGE
 
-        prompt = (
-            f"Χρήστης: {query}\n\n"
-            "Παρακάτω σου δίνω αποσπάσματα από τις σημειώσεις. Χρησιμοποίησέ τα για να απαντήσεις στην ερώτηση:\n\n"
-            f"--- Αποσπάσματα ---\n{context}\n--------------------\n\n"
-            "Παρακαλώ απάντησε όσο πιο ακριβώς γίνεται με βάση τα παραπάνω μόνο."
-        )
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ]
-        )
+def generate_answer_from_chunks(query: str, chunks: List[str], mode: str = "study") -> str:
+    """
+    Use OpenAI GPT to generate an answer from a user query and a list of supporting chunks.
+    Adjusts system prompt and behavior based on selected mode (e.g., study, exam, project).
 
-        return response.choices[0].message.content.strip()  # type: ignore
+    Args:
+        query (str): The user's question.
+        chunks (List[str]): List of relevant text chunks from FAISS.
+        mode (str): Mode of operation: "study", "exam", or "project".
 
+    Returns:
+        str: GPT-generated answer, or an error message if generating it failed at any point.
+    """
+    try:
+        return "".join(_stream_answer_deltas(query, chunks, mode)).strip()
     except Exception as e:
         logging.error(f"Failed to generate answer with GPT: {e}")
-        return "Σφάλμα κατά τη δημιουργία απάντησης."
-
-  
\ No newline at end of file
+        return ANSWER_ERROR_MESSAGE
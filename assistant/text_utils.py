@@ -6,7 +6,7 @@ Text preprocessing utilities for preparing input to LLMs or embedding models.
 Responsibilities:
 - Clean text by removing noise, special characters, and normalizing content
 - Perform Unicode normalization (e.g., removing accents)
-- Split text into overlapping chunks for embedding or LLM input
+- Split text into overlapping chunks for embedding or LLM input (as a list or lazily)
 
 Technologies:
 - re for regular expressions
@@ -16,7 +16,14 @@ Technologies:
 import re
 import unicodedata
 import logging
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
+
+# Compiled once at import time instead of on every clean_text call
+_ALLOWED_RE = re.compile(r"[^Α-Ωα-ωA-Za-z0-9\s.,;:!?(){}\[\]\"'=+\-*/<>%&#|~^@_\\∑∫≠≤≥→⇒∈∀∃π√]")
+_NL_RE = re.compile(r"\n+")
+# Deletion table for combining marks (accents) in the Basic Multilingual Plane, used with
+# str.translate so accent stripping runs in C. Marks outside the BMP are removed by _ALLOWED_RE.
+_COMBINING = {cp: None for cp in range(0x10000) if unicodedata.combining(chr(cp))}
 
 def clean_text(text: str) -> str:
     """
@@ -39,13 +46,11 @@ def clean_text(text: str) -> str:
         if not text:
             return ""
         # Remove accent marks using Unicode normalization
-        text = unicodedata.normalize("NFKD", text)
-        text = ''.join(char for char in text if not unicodedata.combining(char))
-        text = re.sub(r"[^Α-Ωα-ωA-Za-z0-9\s.,;:!?(){}\[\]\"'=+\-*/<>%&#|~^@_\\∑∫≠≤≥→⇒∈∀∃π√]","",text)
-        text = text.replace('\t', ' ')
-        text = re.sub(r'\n+', '\n', text)
-        text = text.strip()
-        return text
+        text = unicodedata.normalize("NFKD", text).translate(_COMBINING)
+        text = _ALLOWED_RE.sub("", text)
+        text = text.replace("\t", " ")
+        text = _NL_RE.sub("\n", text)
+        return text.strip()
     except Exception as e:
         logging.error(f"[ERROR] Failed to clean text: {e}")
         return ""
@@ -63,23 +68,38 @@ def split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
         text (str): The full input text to be chunked.
         chunk_size (int): Maximum number of characters per chunk.
         overlap (int): Number of characters to repeat between chunks to preserve context.
+                       Must be smaller than chunk_size.
 
     Returns:
-        list: List of text chunks (strings). If input is empty or fails, returns an empty list.
+        list: List of text chunks (strings). If input is empty or the sizes are invalid, returns an empty list.
     """
-    try:
-        chunks = []
-        start = 0
+    stride = chunk_size - overlap
+    if stride <= 0:
+        logging.error(f"[ERROR] Failed to split text into chunks: overlap ({overlap}) must be smaller than chunk_size ({chunk_size})")
+        return []
 
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start += chunk_size - overlap
+    return [text[start:start + chunk_size] for start in range(0, len(text), stride)]
 
-        return chunks
 
-    except Exception as e:
-        logging.error(f"[ERROR] Failed to split text into chunks: {e}")
-        return []
+def split_text_iter(text: str, chunk_size: int, overlap: int) -> Iterator[str]:
+    """
+    Lazily yield the same overlapping chunks as split_text, one at a time.
+
+    Use this for very long texts when the chunks are consumed one by one,
+    so the whole list of chunks never has to be held in memory.
+
+    Args:
+        text (str): The full input text to be chunked.
+        chunk_size (int): Maximum number of characters per chunk.
+        overlap (int): Number of characters to repeat between chunks. Must be smaller than chunk_size.
+
+    Yields:
+        str: The next text chunk.
+    """
+    stride = chunk_size - overlap
+    if stride <= 0:
+        logging.error(f"[ERROR] Failed to split text into chunks: overlap ({overlap}) must be smaller than chunk_size ({chunk_size})")
+        return
 
+    for start in range(0, len(text), stride):
+        yield text[start:start + chunk_size]
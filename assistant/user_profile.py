@@ -6,10 +6,11 @@ Tracks user queries, associated course, mode, retrieved chunks, and AI-generated
 
 Responsibilities:
 - Maintain a persistent history of user activity
-- Save user queries and results to a JSON file for later analysis or personalization
+- Append user queries and results to a JSON Lines file for later analysis or personalization
+- Read back the history of a single user
 
 Technologies:
-- JSON for structured data storage
+- JSON Lines (one JSON object per line) for append-only storage
 - datetime for timestamps
 - os for safe file access and creation
 """
@@ -17,9 +18,11 @@ Technologies:
 import json
 import os
 import logging
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 from datetime import datetime
 
+DEFAULT_PROFILE_PATH = "data/user_data/user_profile.jsonl"
+
 def log_user_query(
     user_id: str,
     course: str,
@@ -27,7 +30,7 @@ def log_user_query(
     query: str,
     answer: str,
     retrieved_chunks: List[Dict[str, Any]],
-    profile_path: str = "data/user_data/user_profile.json"
+    profile_path: str = DEFAULT_PROFILE_PATH
 ) -> None:
     """
     Log the user's query, selected course and mode, retrieved chunks, and answer.
@@ -39,7 +42,8 @@ def log_user_query(
         query (str): The question the user asked.
         answer (str): The assistant's response.
         retrieved_chunks (List[Dict[str, Any]]): Text chunks used to generate the answer.
-        profile_path (str): Path to the JSON file where the profile history will be stored.
+        profile_path (str): Path to the JSONL file where the profile history is appended,
+                            one JSON object per line.
 
     Returns:
         None
@@ -48,16 +52,9 @@ def log_user_query(
         # Ensure the directory exists
         os.makedirs(os.path.dirname(profile_path), exist_ok=True)
 
-        # Load existing profile or initialize
-        try:
-            with open(profile_path, "r", encoding="utf-8") as f:
-                profile_data = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            profile_data = {}
-
-
         # Format log entry
         log_entry = {
+            "user_id": user_id,
             "timestamp": datetime.utcnow().isoformat(),
             "course": course,
             "mode": mode,
@@ -72,17 +69,43 @@ def log_user_query(
             ]
         }
 
-        # Append to user history
-        if user_id not in profile_data:
-            profile_data[user_id] = []
-
-        profile_data[user_id].append(log_entry)
-
-        # Save back to file
-        with open(profile_path, "w", encoding="utf-8") as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False)
+        # Append one line per entry: constant cost, no matter how long the history is
+        with open(profile_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
 
         logging.info(f"[INFO] User '{user_id}' query logged successfully.")
 
     except Exception as e:
         logging.error(f"[ERROR] Failed to log user query: {e}")
+
+
+def load_user_history(
+    user_id: str,
+    profile_path: str = DEFAULT_PROFILE_PATH
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the logged entries of one user, oldest first.
+
+    Lines that are not valid JSON (e.g. a partially written last line) are skipped.
+
+    Args:
+        user_id (str): Unique identifier for the user.
+        profile_path (str): Path to the JSONL file written by log_user_query.
+
+    Yields:
+        Dict[str, Any]: The next log entry of the user.
+    """
+    try:
+        with open(profile_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"[WARNING] Skipping malformed line in '{profile_path}'")
+                    continue
+                if entry.get("user_id") == user_id:
+                    yield entry
+    except FileNotFoundError:
+        return
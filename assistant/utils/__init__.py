@@ -0,0 +1,3 @@
+from assistant.utils.timers import timed_function, timed_block
+
+__all__ = ["timed_function", "timed_block"]
@@ -1,5 +1,8 @@
 import time
 import functools
+from contextlib import contextmanager
+
+# time.perf_counter is monotonic and high-resolution, unlike time.time (wall clock)
 
 def timed_function(func):
  
@@ -12,9 +15,26 @@ def timed_function(func):
     
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter()
         result = func(*args, **kwargs)
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         print(f"[TIMER] Function `{func.__name__}` took {duration:.4f} seconds.")
         return result
     return wrapper
+
+
+@contextmanager
+def timed_block(label):
+
+#  Context manager that measures and prints the execution time of a block of code.
+
+# Usage:
+# with timed_block("Embedding"):
+#     ...
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        print(f"[TIMER] {label} took {duration:.4f} seconds.")
@@ -4,7 +4,7 @@ vectorstore_utils.py
 Contains utility functions for managing vector embeddings using FAISS.
 
 Main responsibilities:
-- Store and index text embeddings with FAISS
+- Store and index text embeddings with FAISS (flat, HNSW or IVFPQ indexes)
 - Associate each embedding with metadata (e.g., original text chunks)
 - Save and load FAISS indexes and metadata for persistent use
 - Perform similarity search given a query embedding
@@ -14,87 +14,239 @@ Technologies used:
 - NumPy for converting embeddings to NumPy arrays (FAISS only accepts np.ndarray)
 - Pickle for storing metadata in binary format
 """
+import os
 import faiss
+import math
 import numpy as np
 import pickle 
 import logging
-from typing import List, Dict, Optional, Any
-
-def store_embeddings(
-    embeddings: List[List[float]],
-    metadata: Dict[int, Dict[str, Any]],
-    index_path: str,
-    metadata_path: str
-) -> Optional[np.ndarray]:
+from typing import List, Dict, Literal, Mapping, Optional, Any, cast
+
+from assistant.arrow_metadata import ArrowMetadata, is_arrow_path, save_arrow_metadata
+
+# Storage precision of indexed vectors, see create_faiss_index
+Quantize = Literal["none", "fp16", "int8"]
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq", "ivfpq_fs")
+
+# Scalar quantizer per stored component: fp16 halves and int8 quarters the index size
+_SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+HNSW_M = 32                 # neighbours per node in the HNSW graph
+HNSW_EF_CONSTRUCTION = 200  # candidate list size while building the graph
+
+IVFPQ_M = 64                # sub-quantizers per vector (must divide the dimension)
+IVFPQ_NBITS = 8             # bits per sub-quantizer code -> 64 bytes per 1536-d vector
+IVFPQ_MAX_TRAIN = 256_000   # maximum number of vectors used for training
+IVFPQ_MIN_TRAIN = 39 * 2 ** IVFPQ_NBITS  # FAISS needs ~39 points per centroid to train well
+
+# "ivfpq_fs": OPQ rotation to FASTSCAN_DIM dims, IVF, 4-bit FastScan PQ codes, re-ranking stage
+FASTSCAN_M = 64             # 4-bit sub-quantizers (multiple of 2 for FastScan) -> 32 bytes per vector
+FASTSCAN_DIM = 512          # output dimension of the OPQ rotation (multiple of FASTSCAN_M)
+FASTSCAN_MIN_POINTS_PER_CENTROID = 16  # 4-bit PQ has only 16 centroids per sub-quantizer
+FASTSCAN_MAX_TRAIN = 100_000  # OPQ training is slow on 1536-d vectors; 100k samples are plenty
+FASTSCAN_FACTORY = "OPQ{m}_{d},IVF{nlist},PQ{m}x4fs,{refine}"
+
+# Vectors kept for re-ranking "ivfpq_fs" candidates: float32, or scalar-quantized (2x / 4x smaller)
+_REFINE_STAGES = {
+    "none": "RFlat",
+    "fp16": "Refine(SQfp16)",
+    "int8": "Refine(SQ8)",
+}
+
+
+def _faiss_metric(metric: str) -> int:
+    """
+    Map a metric name to the FAISS metric constant.
+
+    Args:
+        metric (str): "ip" or "l2".
+
+    Returns:
+        int: faiss.METRIC_INNER_PRODUCT or faiss.METRIC_L2.
     """
-    Store embedding vectors and their associated metadata (e.g., text chunks) to disk.
+    if metric == "ip":
+        return faiss.METRIC_INNER_PRODUCT
+    if metric == "l2":
+        return faiss.METRIC_L2
+    raise ValueError(f"Unknown metric '{metric}', expected 'l2' or 'ip'")
 
-    Converts the list of embedding vectors to a NumPy array, builds a FAISS index,
-    and saves both the index and metadata for later retrieval or similarity-based search.
+
+def create_faiss_index(
+    dimension: int,
+    index_type: str = "flat",
+    metric: str = "ip",
+    n_vectors: int = 0,
+    quantize: Quantize = "none"
+) -> faiss.Index:
+    """
+    Create an empty FAISS index of the requested type.
+
+    Indexes with index.is_trained == False ("ivfpq", and "int8" quantization, which learns
+    each component's value range) must be trained before vectors are added; the others
+    can be filled incrementally with index.add.
 
     Args:
-        embeddings (list): List of embedding vectors (lists of floats).
-        metadata (list): List of metadata items (e.g., text chunks) associated with each vector.
-        index_path (str): Path where the FAISS index (.faiss file) will be saved.
-        metadata_path (str): Path where the metadata (.pkl file) will be saved.
+        dimension (int): Embedding dimension.
+        index_type (str): One of INDEX_TYPES.
+        metric (str): "ip" or "l2".
+        n_vectors (int): Number of vectors that will be added (used to size IVF lists).
+        quantize (str): How "flat" and "hnsw" indexes store vectors: "none" (float32),
+                        "fp16" or "int8" (scalar quantization). For "ivfpq_fs" it sets how
+                        the re-ranking stage stores vectors. Ignored for "ivfpq".
 
     Returns:
-        np.ndarray or None: The NumPy array of embeddings if successful, otherwise None.
+        faiss.Index: The new (possibly untrained) index.
     """
-    try:
-        vectors = np.array(embeddings).astype("float32")
-    except Exception as e:
-        logging.error(f"[ERROR] Could not convert embeddings to NumPy: {e}")
-        return
-    
-    try:
-        build_faiss_index(vectors, save_path=index_path)
-    except Exception as e:
-        logging.error(f"[ERROR] Failed to build/save FAISS index: {e}")
-        return
+    faiss_metric = _faiss_metric(metric)
+    if quantize != "none" and quantize not in _SQ_TYPES:
+        raise ValueError(f"Unknown quantization '{quantize}', expected 'none', 'fp16' or 'int8'")
 
-    try:
-        save_metadata(metadata, path=metadata_path)
-    except Exception as e:
-        logging.error(f"[ERROR] Failed to save metadata: {e}")
-        return
+    if index_type == "flat":
+        if quantize != "none":
+            return faiss.IndexScalarQuantizer(dimension, _SQ_TYPES[quantize], faiss_metric)
+        return faiss.IndexFlatIP(dimension) if metric == "ip" else faiss.IndexFlatL2(dimension)
 
-    logging.info("[INFO] Embeddings and metadata successfully stored.")
-    return vectors
-    
+    if index_type == "hnsw":
+        hnsw_index: faiss.IndexHNSW
+        if quantize != "none":
+            # The type stubs only list the (d, ScalarQuantizer) overload of the constructor
+            hnsw_index = faiss.IndexHNSWSQ(dimension, _SQ_TYPES[quantize], HNSW_M, faiss_metric)  # type: ignore[arg-type]
+        else:
+            hnsw_index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss_metric)
+        hnsw_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        return hnsw_index
+
+    if index_type == "ivfpq" and quantize != "none":
+        logging.warning(f"[WARNING] quantize='{quantize}' is ignored for IVFPQ indexes (already product-quantized)")
+
+    if index_type == "ivfpq_fs":
+        nlist = 4 * int(math.sqrt(n_vectors))
+        factory = FASTSCAN_FACTORY.format(m=FASTSCAN_M, d=FASTSCAN_DIM, nlist=nlist, refine=_REFINE_STAGES[quantize])
+        index = faiss.index_factory(dimension, factory, faiss_metric)
+        # OPQ (learned in index.train) rotates the embeddings so every PQ sub-space gets a similar
+        # share of the variance; the PQ codebooks are trained on the rotated vectors
+        ivf = cast(faiss.IndexIVFPQFastScan, faiss.downcast_index(faiss.extract_index_ivf(index)))
+        ivf.pq.cp.min_points_per_centroid = FASTSCAN_MIN_POINTS_PER_CENTROID
+        return index
+
+    if index_type == "ivfpq":
+        if dimension % IVFPQ_M != 0:
+            raise ValueError(f"IVFPQ needs a dimension divisible by {IVFPQ_M}, got {dimension}")
+        nlist = 4 * int(math.sqrt(n_vectors))
+        quantizer = faiss.IndexFlatIP(dimension) if metric == "ip" else faiss.IndexFlatL2(dimension)
+        return faiss.IndexIVFPQ(quantizer, dimension, nlist, IVFPQ_M, IVFPQ_NBITS, faiss_metric)
+
+    raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+
+
+def _training_sample(vectors: np.ndarray, max_size: int) -> np.ndarray:
+    """
+    Pick a random subset of at most `max_size` rows to train an index on.
+
+    Args:
+        vectors (np.ndarray): All vectors, shape (n, d).
+        max_size (int): Maximum number of rows in the sample.
+
+    Returns:
+        np.ndarray: The sample (or `vectors` itself if it is small enough).
+    """
+    if len(vectors) <= max_size:
+        return vectors
+    rows = np.random.default_rng(0).choice(len(vectors), size=max_size, replace=False)
+    return vectors[np.sort(rows)]
+
+
+def write_index(index: faiss.Index, path: str) -> None:
+    """
+    Write a FAISS index to disk by replacing the file instead of overwriting it in place.
+
+    Searchers memory-map index files (see search_engine.load_index_and_metadata); writing to a
+    temporary file and renaming it keeps the old file intact for processes that still map it.
+
+    Args:
+        index (faiss.Index): The index to save.
+        path (str): Destination path of the index file.
+
+    Returns:
+        None
+    """
+    tmp_path = f"{path}.tmp"
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
 
 
 def build_faiss_index(
     vectors: np.ndarray,
-    save_path: Optional[str] = None
-) -> Optional[faiss.IndexFlatL2]:
+    save_path: Optional[str] = None,
+    metric: str = "ip",
+    index_type: str = "flat",
+    quantize: Quantize = "none"
+) -> Optional[faiss.Index]:
     """
     Build a FAISS index from a NumPy array of embedding vectors.
 
-    The index uses L2 (Euclidean) distance for similarity search and can be
-    optionally saved to disk for future reuse.
+    Index types:
+    - "flat" (default): exact brute-force search, best for small corpora.
+    - "hnsw": HNSW graph index; roughly logarithmic query time at ~95-99% recall.
+    - "ivfpq": inverted lists + product quantization; each vector is compressed to
+      64 bytes, for corpora too large to keep in RAM at full precision. Needs at least
+      IVFPQ_MIN_TRAIN vectors to train; smaller inputs fall back to "flat".
+    - "ivfpq_fs": OPQ-rotated IVF with 4-bit FastScan PQ codes (scanned with SIMD lookups),
+      followed by a re-ranking of the best candidates against more precise stored vectors.
+      Same training requirement as "ivfpq".
+
+    "flat" and "hnsw" indexes can also store the vectors scalar-quantized to fp16 (2x smaller)
+    or int8 (4x smaller, ~99% recall) with the `quantize` argument; for "ivfpq_fs" it applies
+    to the vectors of the re-ranking stage (e.g. "int8" gives an SQ8 refine stage).
+
+    The index can be optionally saved to disk for future reuse.
 
     Args:
         vectors (np.ndarray): 2D NumPy array of shape (n_samples, embedding_dim),
                               where each row is an embedding vector.
         save_path (str, optional): Path to save the FAISS index to disk.
                                    If None, the index is not saved.
+        metric (str): "ip" (default) for inner product on L2-normalized vectors, i.e. cosine
+                      similarity, which is how OpenAI embeddings are meant to be compared.
+                      The vectors are normalized in place before being added.
+                      "l2" keeps plain Euclidean distance on the raw vectors.
+        index_type (str): "flat", "hnsw", "ivfpq" or "ivfpq_fs".
+        quantize (str): "none" (default, float32), "fp16" or "int8".
 
     Returns:
-        faiss.IndexFlatL2 or None: A FAISS index object if successful, or None on failure.
+        faiss.Index or None: A FAISS index object if successful, or None on failure.
     """
     # Get the number of dimensions from a single embedding - 1536 because we use openAI
     try: 
-        dimension = vectors.shape[1]  
-        logging.info(f"[INFO] Creating FAISS index with dimension: {dimension}")
+        n_vectors, dimension = vectors.shape
+
+        if index_type in ("ivfpq", "ivfpq_fs") and n_vectors < IVFPQ_MIN_TRAIN:
+            logging.warning(
+                f"[WARNING] {n_vectors} vectors are too few to train IVFPQ (need {IVFPQ_MIN_TRAIN}), using a flat index"
+            )
+            index_type = "flat"
+
+        logging.info(f"[INFO] Creating FAISS {index_type} index ({metric}, quantize={quantize}) with dimension: {dimension}")
+        index = create_faiss_index(dimension, index_type, metric, n_vectors, quantize)
+
+        if metric == "ip":
+            faiss.normalize_L2(vectors)
+
+        if not index.is_trained:
+            sample = _training_sample(vectors, FASTSCAN_MAX_TRAIN if index_type == "ivfpq_fs" else IVFPQ_MAX_TRAIN)
+            logging.info(f"[INFO] Training FAISS index on {len(sample)} vectors...")
+            index.train(sample) # type: ignore[arg-type]
 
-        index = faiss.IndexFlatL2(dimension)
         index.add(vectors) # type: ignore[arg-type]
         logging.info(f"[INFO] FAISS index created with {index.ntotal} vectors.")
 
         # (Optional): Save the index to disk
         if save_path:
-            faiss.write_index(index, save_path)
+            write_index(index, save_path)
             logging.info(f"[INFO] FAISS index saved to '{save_path}'")
 
         return index
@@ -104,6 +256,9 @@ def build_faiss_index(
     
 
 
+METADATA_BUFFER_SIZE = 1 << 20
+
+
 def save_metadata(metadata_dict: Dict[int, Dict[str, Any]], path: str) -> None:
     """
     Save a metadata list (e.g., text chunks) to disk using pickle serialization.
@@ -111,37 +266,48 @@ def save_metadata(metadata_dict: Dict[int, Dict[str, Any]], path: str) -> None:
     This ensures persistence of the original text data associated with vector embeddings,
     enabling later retrieval or use in similarity search tasks.
 
+    Paths ending in .arrow or .feather are saved as a memory-mappable Arrow table instead
+    (see arrow_metadata.py); this needs vector ids 0..N-1.
+
     Args:
         metadata_list (list): List of text chunks or any metadata corresponding to embeddings.
-        path (str): Destination file path to save the metadata (.pkl format).
+        path (str): Destination file path to save the metadata (.pkl, .arrow or .feather format).
 
     Returns:
         None
     """
     try:
-        with open(path,"wb") as f:
-            pickle.dump(metadata_dict, f)
+        if is_arrow_path(path):
+            save_arrow_metadata(metadata_dict, path)
+        else:
+            # Newest pickle protocol (faster and more compact) through a 1 MiB write buffer
+            with open(path, "wb", buffering=METADATA_BUFFER_SIZE) as f:
+                pickle.dump(metadata_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
         logging.info(f"[INFO] Metadata successfully saved to: {path}")
     except Exception as e:
         logging.error(f"[ERROR] Failed to save metadata to '{path}': {e}")
 
 
-def load_metadata(path: str) -> Optional[List[Dict[str, Any]]]:
+def load_metadata(path: str) -> Optional[Mapping[int, Dict[str, Any]]]:
     """
     Load a list of metadata (e.g., text chunks) from disk using pickle.
 
     This function is typically used to retrieve original text data that corresponds
     to previously generated vector embeddings (e.g., for search or result display).
 
+    Arrow files (.arrow / .feather) are memory-mapped and returned as an ArrowMetadata mapping.
+
     Args:
-        path (str): Path to the pickle (.pkl) file where metadata is stored.
+        path (str): Path to the pickle (.pkl) or Arrow file where metadata is stored.
 
     Returns:
-        list or None: The metadata list if loading succeeds, otherwise None on error.
+        dict-like or None: The metadata if loading succeeds, otherwise None on error.
     """
     try:
-        with open(path,"rb") as f:
-            metadata = pickle.load( f)
+        if is_arrow_path(path):
+            return ArrowMetadata.open(path)
+        with open(path, "rb", buffering=METADATA_BUFFER_SIZE) as f:
+            metadata = pickle.load(f)
         return metadata
     except Exception as e:
         logging.error(f"[ERROR] Failed to load metadata from '{path}': {e}")
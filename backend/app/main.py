@@ -2,7 +2,7 @@ from fastapi import FastAPI, Request
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 
-from assistant.search_engine import load_index_and_metadata, search_similar_chunks
+from assistant.search_engine import get_index_and_metadata, search_similar_chunks
 from assistant.qa_engine import generate_answer  
 
 app = FastAPI()
@@ -25,9 +25,10 @@ class QueryRequest(BaseModel):
 def query_route(payload: QueryRequest):
     try:
         index_path = f"data/vector_store/{payload.course.lower()}_index.faiss"
-        metadata_path = f"data/vector_store/{payload.course.lower()}_metadata.pkl"
+        metadata_path = f"data/vector_store/{payload.course.lower()}_metadata.arrow"
 
-        index, metadata = load_index_and_metadata(index_path, metadata_path)
+        # Loaded from disk once per course, then served from memory
+        index, metadata = get_index_and_metadata(index_path, metadata_path)
         chunks = search_similar_chunks(payload.query, index, metadata, top_k=3)
         answer = generate_answer(payload.query, chunks)
 
@@ -9,14 +9,12 @@ metadata are saved separately for each course to support course-specific retriev
 
 import os
 import logging
-import pickle
-import faiss
-import numpy as np
-from typing import List, Dict, Any
 
-from assistant.pdf_reader import extract_text, load_pdf
-from assistant.text_utils import clean_text, split_text
-from assistant.embedding_utils import get_embeddings
+from assistant.pdf_reader import iter_pdf_pages, load_pdf
+from assistant.pipeline import pipeline
+from assistant.search_engine import clear_index_cache
+from assistant.utils import timed_block
+from assistant.vectorstore_utils import Quantize
 
 
 def setup_logging() -> None:
@@ -32,7 +30,9 @@ def build_vectorstore(
     metadata_output_path: str,
     course: str,
     chunk_size: int = 500,
-    chunk_overlap: int = 50
+    chunk_overlap: int = 50,
+    index_type: str = "hnsw",
+    quantize: Quantize = "none"
 ) -> None:
     """
     Builds a FAISS index and metadata store from a given PDF file.
@@ -40,51 +40,45 @@ def build_vectorstore(
     Args:
         pdf_path (str): Path to the PDF file.
         index_output_path (str): Output path for the FAISS index.
-        metadata_output_path (str): Output path for the metadata pickle file.
+        metadata_output_path (str): Output path for the metadata file (.arrow / .feather for Arrow, otherwise pickle).
         course (str): Name of the course the PDF belongs to.
         chunk_size (int): Number of characters per text chunk.
         chunk_overlap (int): Number of overlapping characters between chunks.
+        index_type (str): FAISS index type: "flat", "hnsw", "ivfpq" or "ivfpq_fs" (see build_faiss_index).
+                          Defaults to "hnsw" (HNSW32, inner product), which keeps near-exact recall
+                          with logarithmic query time on course-sized corpora.
+        quantize (str): Storage precision of the indexed vectors: "none", "fp16" or "int8".
 
     Returns:
         None
     """
-    ""
     try:
         doc = load_pdf(pdf_path)
-        raw_text = extract_text(doc)
-        cleaned_text = clean_text(raw_text)
-        chunks = split_text(cleaned_text, chunk_size, chunk_overlap)
-
-        logging.info(f"Extracted {len(chunks)} chunks from PDF.")
-
-        embeddings = get_embeddings(chunks)
-        valid_embeddings = [e for e in embeddings if e is not None]
-
-        if not valid_embeddings:
-            raise ValueError("No valid embeddings were generated.")
-
-        dimension = len(valid_embeddings[0])
-        index = faiss.IndexFlatL2(dimension)
-        index.add(np.array(valid_embeddings, dtype=np.float32))  # type: ignore[arg-type]
-
-        # Creating metadata only for the chunks that were succesfull
-        metadata: Dict[int, Dict] = {}
-        valid_index = 0
-
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            if embedding is not None:
-                metadata[valid_index] = {
-                    "text": chunk,
-                    "chunk_id": valid_index,
+        if doc is None:
+            raise ValueError(f"Could not open PDF: {pdf_path}")
+
+        pages = iter_pdf_pages(pdf_path, doc)
+
+        with timed_block("Vector store build"):
+            # Metadata is created only for the chunks that were embedded successfully
+            index = pipeline(
+                pages,
+                index_output_path,
+                metadata_output_path,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                index_type=index_type,
+                quantize=quantize,
+                extra_metadata={
                     "filename": os.path.basename(pdf_path),
                     "course": course  # Tag course
                 }
-                valid_index += 1
+            )
+        if index is None:
+            raise RuntimeError("Failed to build the vector store.")
 
-        # Save index and metadata
-        faiss.write_index(index, index_output_path)
-        with open(metadata_output_path, "wb") as f:
-            pickle.dump(metadata, f)
+        # Searches in this process must not keep serving the previous version of the index
+        clear_index_cache()
 
         logging.info("Vector store created and saved successfully.")
 
@@ -99,6 +93,6 @@ if __name__ == "__main__":
     build_vectorstore(
         pdf_path="data/pdfs/os/test.pdf",
         index_output_path="data/vector_store/os_index.faiss",
-        metadata_output_path="data/vector_store/os_metadata.pkl",
+        metadata_output_path="data/vector_store/os_metadata.arrow",
         course="os"
     )
\ No newline at end of file
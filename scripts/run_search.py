@@ -8,11 +8,11 @@ answers using OpenAI GPT models.
 
 How it works:
 1. Loads a FAISS index and corresponding metadata from disk.
-2. Prompts the user for a query.
-3. Converts the query to an embedding.
-4. Searches the index for the most similar chunks.
+2. Prompts the user for a query (several lines pasted at once are handled as one batch).
+3. Converts the queries to embeddings.
+4. Searches the index for the most similar chunks of all queries in one call.
 5. Displays the results with metadata and similarity scores.
-6. Passes results to GPT to generate a natural language answer.
+6. Passes results to GPT to generate a natural language answer, printed as it streams in.
 
 Usage:
     Run the script directly and enter queries when prompted.
@@ -21,14 +21,54 @@ Example:
     $ python scripts/run_search.py
 """
 
+import sys
+import queue
+import atexit
 import logging
+import threading
+from typing import Dict, List, Optional
 from assistant.user_profile import log_user_query
 from assistant.search_engine import (
-    load_index_and_metadata,
-    search_similar_chunks,
-    generate_answer_from_chunks
+    get_index_and_metadata,
+    move_index_to_gpu,
+    search_similar_chunks_batch,
+    stream_answer_from_chunks
 )
 
+# Lines pasted together (or piped in) are answered as one batch: one embedding request and
+# one index.search. A batch ends after INPUT_IDLE_SECONDS without input or MAX_QUERY_BATCH lines.
+INPUT_IDLE_SECONDS = 0.2
+MAX_QUERY_BATCH = 32
+
+_SEPARATOR = "-" * 60 + "\n"
+
+
+def _log_worker(log_queue: "queue.Queue[Dict]") -> None:
+    """
+    Write queued query logs with log_user_query, one at a time, for the lifetime of the process.
+
+    Args:
+        log_queue (queue.Queue): Queue of log_user_query keyword arguments.
+
+    Returns:
+        None
+    """
+    while True:
+        entry = log_queue.get()
+        try:
+            log_user_query(**entry)
+        except Exception as e:
+            logging.error(f"Failed to log query: {e}")
+        finally:
+            log_queue.task_done()
+
+
+# Query logs are written by a background thread so disk I/O never delays the next question;
+# pending entries are flushed before the interpreter exits
+_log_q: "queue.Queue[Dict]" = queue.Queue()
+threading.Thread(target=_log_worker, args=(_log_q,), name="query-log-writer", daemon=True).start()
+atexit.register(_log_q.join)
+
 
 def setup_logging() -> None:
     """
@@ -43,7 +83,7 @@ def setup_logging() -> None:
     )
 
 
-def run_interactive_search(index_path: str, metadata_path: str, top_k: int = 3, course: str = "", mode: str = "study") -> None:
+def run_interactive_search(index_path: str, metadata_path: str, top_k: int = 3, course: str = "", mode: str = "study", use_gpu: bool = False) -> None:
 
     """
     Run an interactive loop where the user can enter queries 
@@ -51,8 +91,12 @@ def run_interactive_search(index_path: str, metadata_path: str, top_k: int = 3,
 
     Args:
         index_path (str): Path to the FAISS index file.
-        metadata_path (str): Path to the metadata pickle file.
+        metadata_path (str): Path to the metadata file (Arrow or pickle).
         top_k (int): Number of top results to retrieve per query.
+        course (str): Name of the course being searched.
+        mode (str): Answer mode: "study", "exam" or "project".
+        use_gpu (bool): Search on the GPU(s). Requires a GPU build of FAISS (faiss-gpu);
+                        falls back to the CPU index if no GPU can be used.
 
     Returns:
         None
@@ -62,7 +106,11 @@ def run_interactive_search(index_path: str, metadata_path: str, top_k: int = 3,
         print("Interactive Search Mode (type 'exit' to quit)\n")
 
         logging.info("Loading FAISS index and metadata...")
-        index, metadata = load_index_and_metadata(index_path, metadata_path)
+        # Cached per (path, mtime): repeated sessions in one process reuse the loaded (memory-mapped) index
+        index, metadata = get_index_and_metadata(index_path, metadata_path)
+        if use_gpu:
+            # Only the index moves to the GPU; metadata stays in host memory
+            index = move_index_to_gpu(index)
         print("FAISS index size:", index.ntotal)
         print("Metadata size:", len(metadata))
 
@@ -73,49 +121,130 @@ def run_interactive_search(index_path: str, metadata_path: str, top_k: int = 3,
 
     print("\nInteractive Search Mode (type 'exit' to quit)\n")
 
-    while True:
+    lines = _start_input_collector()
+    done = False
+    while not done:
         try:
-            query = input("Enter your question: ").strip()
-            if query.lower() == "exit":
-                print("Exiting search.")
-                break
-
-            results = search_similar_chunks(query, index, metadata, top_k=top_k)
+            sys.stdout.write("Enter your question: ")
+            sys.stdout.flush()
+            batch = _collect_queries(lines)
 
-            if not results:
-                print("No results found.")
+            queries: List[str] = []
+            for line in batch:
+                if line is None or line.strip().lower() == "exit":
+                    done = True
+                    break
+                if line.strip():
+                    queries.append(line.strip())
+            if not queries:
                 continue
+            if len(queries) > 1:
+                logging.info(f"Searching {len(queries)} queries in one batch.")
 
-            print("\nTop Relevant Chunks:\n")
-            for i, r in enumerate(results, 1):
-                print(f"Result #{i}")
-                print(f"Chunk ID: {r.get('chunk_id')} | Score: {r['score']:.4f}")
-                if "filename" in r:
-                    print(f"File: {r['filename']}")
-                print(f"Text Preview:\n{r['text'][:300]}...")
-                print("-" * 60)
-
-            top_chunks = [r["text"] for r in results]
-            answer = generate_answer_from_chunks(query, top_chunks, mode= mode)
-
-            print("\nAnswer:\n", answer)
-            print("=" * 80)
-
-            
-            log_user_query(
-                user_id="user_001",  # προσωρινά σταθερό 
-                course=course,
-                mode=mode,
-                query=query,
-                answer=answer,
-                retrieved_chunks=results)
+            for query, results in zip(queries, search_similar_chunks_batch(queries, index, metadata, top_k=top_k)):
+                _answer_query(query, results, course, mode)
 
         except KeyboardInterrupt:
             print("\nSearch interrupted by user.")
-            break
+            return
         except Exception as e:
             logging.error(f"Error during search: {e}")
 
+    print("Exiting search.")
+
+
+def _start_input_collector() -> "queue.Queue[Optional[str]]":
+    """
+    Start a daemon thread that reads stdin lines into a queue, so that lines pasted
+    together can be picked up as one batch. None is queued at end of input.
+
+    Returns:
+        queue.Queue: The queue of input lines.
+    """
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    # Raw binary readline avoids input()'s per-call prompt handling and text-layer overhead
+    readline = sys.stdin.buffer.readline
+    encoding = sys.stdin.encoding or "utf-8"
+
+    def read_lines() -> None:
+        while line := readline():
+            lines.put(line.decode(encoding, errors="replace"))
+        lines.put(None)
+
+    threading.Thread(target=read_lines, name="stdin-reader", daemon=True).start()
+    return lines
+
+
+def _collect_queries(lines: "queue.Queue[Optional[str]]") -> List[Optional[str]]:
+    """
+    Wait for the next input line, then keep collecting lines until input has been idle
+    for INPUT_IDLE_SECONDS or MAX_QUERY_BATCH lines have arrived.
+
+    Args:
+        lines (queue.Queue): Queue filled by _start_input_collector.
+
+    Returns:
+        List[Optional[str]]: The collected lines, in arrival order (None means end of input).
+    """
+    batch = [lines.get()]
+    while batch[-1] is not None and len(batch) < MAX_QUERY_BATCH:
+        try:
+            batch.append(lines.get(timeout=INPUT_IDLE_SECONDS))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _answer_query(query: str, results: List[Dict], course: str, mode: str) -> None:
+    """
+    Print the retrieved chunks and the GPT answer for one query, then queue it for logging.
+
+    Args:
+        query (str): The user's question.
+        results (List[Dict]): Search results for the query.
+        course (str): Name of the course being searched.
+        mode (str): Answer mode: "study", "exam" or "project".
+
+    Returns:
+        None
+    """
+    if not results:
+        sys.stdout.write("No results found.\n")
+        return
+
+    # Build the whole block and print it once; every result already carries its "preview"
+    out = ["\nQuestion: ", query, "\n\nTop Relevant Chunks:\n\n"]
+    for i, r in enumerate(results, 1):
+        out += ["Result #", str(i), "\nChunk ID: ", str(r.get("chunk_id")), " | Score: ", format(r["score"], ".4f"), "\n"]
+        if r.get("filename"):
+            out += ["File: ", r["filename"], "\n"]
+        out += ["Text Preview:\n", r.get("preview", ""), "...\n", _SEPARATOR]
+    out.append("\nAnswer:\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
+
+    top_chunks = [r["text"] for r in results]
+
+    # Print the answer as it is generated; keep the full text for the query log
+    parts: List[str] = []
+    for delta in stream_answer_from_chunks(query, top_chunks, mode=mode):
+        parts.append(delta)
+        sys.stdout.write(delta)
+        sys.stdout.flush()
+    answer = "".join(parts).strip()
+    sys.stdout.write("\n" + "=" * 80 + "\n")
+    sys.stdout.flush()
+
+    
+    _log_q.put(dict(
+        user_id="user_001",  # προσωρινά σταθερό 
+        course=course,
+        mode=mode,
+        query=query,
+        answer=answer,
+        retrieved_chunks=results))
+
 
 def main() -> None:
     """
@@ -126,13 +255,16 @@ def main() -> None:
     """
     
     setup_logging()
+    # Output is flushed explicitly after each prompt, result block and answer delta,
+    # so stdout does not need to flush on every newline
+    sys.stdout.reconfigure(line_buffering=False)  # type: ignore[union-attr]
     course = "os"
     mode = "study"
 
     index_path = f"data/vector_store/{course}_index.faiss"
-    metadata_path = f"data/vector_store/{course}_metadata.pkl"
+    metadata_path = f"data/vector_store/{course}_metadata.arrow"
 
-    run_interactive_search(index_path, metadata_path, top_k=3, course=course, mode=mode)
+    run_interactive_search(index_path, metadata_path, top_k=3, course=course, mode=mode, use_gpu=False)
 
 
 if __name__ == "__main__":
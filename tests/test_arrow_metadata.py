@@ -0,0 +1,30 @@
+import pytest
+
+from assistant.arrow_metadata import ArrowMetadata, is_arrow_path, save_arrow_metadata
+
+
+# Tests for the Arrow metadata store. They run fully offline on files in pytest's `tmp_path`.
+
+def test_arrow_roundtrip_and_take(tmp_path):
+    path = str(tmp_path / "metadata.arrow")
+    save_arrow_metadata({1: {"text": "β", "chunk_id": 1}, 0: {"text": "α", "chunk_id": 0}}, path)
+
+    metadata = ArrowMetadata.open(path)
+    assert len(metadata) == 2
+    assert metadata[0] == {"text": "α", "chunk_id": 0}
+    assert metadata.take([1, 0]) == [{"text": "β", "chunk_id": 1}, {"text": "α", "chunk_id": 0}]
+    assert 2 not in metadata and -1 not in metadata and "0" not in metadata
+
+def test_arrow_requires_consecutive_ids(tmp_path):
+    assert is_arrow_path("x.ARROW") and not is_arrow_path("x.pkl")
+    with pytest.raises(ValueError):
+        save_arrow_metadata({0: {"text": "a"}, 2: {"text": "b"}}, str(tmp_path / "bad.arrow"))
+
+def test_arrow_rewrite_keeps_open_mapping(tmp_path):
+    path = str(tmp_path / "metadata.arrow")
+    save_arrow_metadata({0: {"text": "old"}}, path)
+    metadata = ArrowMetadata.open(path)
+
+    save_arrow_metadata({0: {"text": "new"}, 1: {"text": "newer"}}, path)
+    assert metadata.take([0]) == [{"text": "old"}]
+    assert ArrowMetadata.open(path)[1] == {"text": "newer"}
@@ -0,0 +1,24 @@
+from assistant.embedding_cache import SqliteEmbeddingCache, make_cache_key
+
+MODEL = "text-embedding-ada-002"
+
+
+# Tests for the on-disk embedding cache.
+# Each test uses pytest's `tmp_path`, so no real cache file is touched and no API call is made.
+
+def test_cache_miss_returns_none(tmp_path):
+    cache = SqliteEmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    assert cache.get_many(MODEL, ["never seen"]) == [None]
+
+def test_cache_roundtrip_preserves_order(tmp_path):
+    cache = SqliteEmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    cache.put_many(MODEL, ["a", "b", "failed"], [[0.5, 1.0], [2.0, -1.0], None])
+
+    assert cache.get_many(MODEL, ["b", "missing", "a", "failed"]) == [[2.0, -1.0], None, [0.5, 1.0], None]
+
+def test_cache_is_keyed_by_model(tmp_path):
+    cache = SqliteEmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    cache.put_many(MODEL, ["a"], [[1.0]])
+
+    assert cache.get_many("other-model", ["a"]) == [None]
+    assert make_cache_key(MODEL, "a") != make_cache_key("other-model", "a")
@@ -1,8 +1,18 @@
 import os
+import glob
 import time
+import asyncio
 import pytest
 from assistant.embedding_utils import get_embeddings
 
+# get_embeddings runs its concurrent requests with asyncio.run; use uvloop's faster
+# event loop for it when available (not supported on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Sample test data
 chunks = [
     "Hello world, this is a test.",
@@ -45,7 +55,8 @@ def test_embedding_vector_type_and_length(embeddings_result):
     assert len(first) > 100, "Embedding vector is unexpectedly short"
 
 def test_log_file_created():
-    log_files = [f for f in os.listdir() if f.startswith("embedding_log_") and f.endswith(".txt")]
+    # main.setup_logging writes timestamped files to logs/; match them directly instead of listing the cwd
+    log_files = glob.glob(os.path.join("logs", "embedding_log_*.txt"))
     assert len(log_files) > 0, "No log file with timestamp was created"
 
 def test_embedding_execution_time(embeddings_result):
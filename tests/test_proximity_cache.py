@@ -0,0 +1,37 @@
+import numpy as np
+
+from assistant.proximity_cache import ProximityCache, cache_enabled
+
+
+# Tests for the semantic query cache. They run fully offline on small hand-made vectors.
+
+def unit(*values):
+    vector = np.array([values], dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_hit_and_miss_at_threshold():
+    cache = ProximityCache(2, threshold=0.97)
+    cache.insert(unit(1.0, 0.0), [{"text": "a"}])
+
+    # cos = 0.98 -> hit, cos = 0.96 -> miss
+    assert cache.lookup(unit(0.98, np.sqrt(1 - 0.98 ** 2))) == [{"text": "a"}]
+    assert cache.lookup(unit(0.96, np.sqrt(1 - 0.96 ** 2))) is None
+
+def test_lru_eviction_removes_oldest_row():
+    cache = ProximityCache(2, capacity=2, threshold=0.99)
+    cache.insert(unit(1.0, 0.0), [{"text": "x"}])
+    cache.insert(unit(0.0, 1.0), [{"text": "y"}])
+    assert cache.lookup(unit(1.0, 0.0)) == [{"text": "x"}]  # y is now least recently used
+
+    cache.insert(unit(-1.0, 0.0), [{"text": "z"}])
+    assert len(cache) == 2
+    assert cache.lookup(unit(0.0, 1.0)) is None
+    assert cache.lookup(unit(1.0, 0.0)) == [{"text": "x"}]
+    assert cache.lookup(unit(-1.0, 0.0)) == [{"text": "z"}]
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("PROXIMITY_CACHE_THRESHOLD", raising=False)
+    assert not cache_enabled()
+    monkeypatch.setenv("PROXIMITY_CACHE_THRESHOLD", "0.98")
+    assert cache_enabled()
+    assert ProximityCache(2).threshold == 0.98
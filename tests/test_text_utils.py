@@ -0,0 +1,33 @@
+from assistant.pipeline import iter_chunks
+from assistant.text_utils import clean_text, split_text, split_text_iter
+
+
+# Tests for the text preprocessing helpers. They run fully offline.
+
+def test_clean_text_strips_accents_and_noise():
+    raw = "  Άλγεβρα\t(α+β)²  ≤ γ\n\n\nΤέλος ☺  "
+    assert clean_text(raw) == "Αλγεβρα (α+β)2  ≤ γ\nΤελος"
+
+def test_clean_text_empty_input():
+    assert clean_text("") == ""
+
+def test_split_text_overlapping_chunks():
+    assert split_text("abcdefghij", 4, 1) == ["abcd", "defg", "ghij", "j"]
+
+def test_split_text_iter_matches_split_text():
+    text = "x" * 1234 + "y" * 567
+    assert list(split_text_iter(text, 500, 50)) == split_text(text, 500, 50)
+
+def test_split_text_rejects_overlap_not_smaller_than_chunk():
+    assert split_text("abcdef", 3, 3) == []
+    assert list(split_text_iter("abcdef", 3, 5)) == []
+
+def test_iter_chunks_matches_split_text_on_joined_pages():
+    pages = ["abcd", "", "efghij", "kl"]
+    joined = "abcd\nefghij\nkl"
+    for chunk_size, overlap in [(4, 0), (4, 1), (5, 2), (100, 10)]:
+        assert list(iter_chunks(pages, chunk_size, overlap)) == split_text(joined, chunk_size, overlap)
+
+def test_iter_chunks_keeps_separator_after_page_on_chunk_boundary():
+    # "abcd" fills the first chunk exactly, leaving the buffer empty before the next page
+    assert list(iter_chunks(["abcd", "ef"], 4, 0)) == ["abcd", "\nef"]